@@ -0,0 +1,173 @@
+import hashlib
+from collections import Counter, defaultdict
+
+import pandas as pd
+
+
+# Fingerprint dataset: berubah kalau isi kolom yang dipakai agregat berubah
+def data_fingerprint(df, columns=('Kategori', 'Sentiment', 'problem')):
+    columns = [c for c in columns if c in df.columns]
+    hashes = pd.util.hash_pandas_object(df[columns], index=False).values
+    return hashlib.sha1(hashes.tobytes()).hexdigest()
+
+
+# Agregat per kategori: jumlah sentimen dan jumlah aspek per sentimen.
+# Dibangun sekali per versi dataset, lalu di-update per baris baru (O(1) per baris).
+class CategoryAggregates:
+    def __init__(self):
+        self.sentiment_counts = defaultdict(Counter)                      # kategori -> sentimen -> n
+        self.aspect_counts = defaultdict(lambda: defaultdict(Counter))    # kategori -> sentimen -> aspek -> n
+        self.rows = 0
+
+    # Bangun dari tabel panjang (row_id, aspect) hasil problems.explode_problems (vectorized)
+    @classmethod
+    def from_table(cls, df, aspect_table):
+        aggregates = cls()
+        for (category, sentiment), n in df.groupby(['Kategori', 'Sentiment'], sort=False, observed=True).size().items():
+            aggregates.sentiment_counts[category][sentiment] += int(n)
+
+        row_ids = aspect_table['row_id'].to_numpy()
+        long_table = pd.DataFrame({
+            'Kategori': df['Kategori'].to_numpy()[row_ids],
+            'Sentiment': df['Sentiment'].to_numpy()[row_ids],
+            'aspect': aspect_table['aspect'],
+        })
+        # sort=False menjaga urutan kemunculan pertama (sama seperti Counter biasa)
+        sizes = long_table.groupby(['Kategori', 'Sentiment', 'aspect'], sort=False, observed=True).size()
+        for (category, sentiment, aspect), n in sizes.items():
+            aggregates.aspect_counts[category][sentiment][aspect] += int(n)
+
+        aggregates.rows = len(df)
+        return aggregates
+
+    def add(self, category, sentiment, aspects):
+        self.sentiment_counts[category][sentiment] += 1
+        if aspects:
+            self.aspect_counts[category][sentiment].update(aspects)
+        self.rows += 1
+
+    # Tambahkan agregat lain (mis. partisi kategori yang baru di-load)
+    def merge(self, other):
+        for category, counts in other.sentiment_counts.items():
+            self.sentiment_counts[category].update(counts)
+        for category, per_sentiment in other.aspect_counts.items():
+            for sentiment, counts in per_sentiment.items():
+                self.aspect_counts[category][sentiment].update(counts)
+        self.rows += other.rows
+        return self
+
+    def total(self, category):
+        return sum(self.sentiment_counts[category].values())
+
+    def sentiment(self, category):
+        # Urutan sama dengan value_counts(): terbanyak dulu
+        counts = self.sentiment_counts[category]
+        return pd.Series(dict(counts.most_common()), dtype='int64')
+
+    def aspects(self, category, sentiment):
+        return self.aspect_counts[category][sentiment]
+
+    # Gabungan aspek negatif + positif (untuk panel Tren Aspek)
+    def all_aspects(self, category):
+        return self.aspects(category, 'Negatif') + self.aspects(category, 'Positif')
+
+    def __getstate__(self):
+        # defaultdict dengan lambda tidak bisa di-pickle (dibutuhkan st.cache_data)
+        return {
+            'sentiment_counts': {k: dict(v) for k, v in self.sentiment_counts.items()},
+            'aspect_counts': {k: {s: dict(c) for s, c in v.items()} for k, v in self.aspect_counts.items()},
+            'rows': self.rows,
+        }
+
+    def __setstate__(self, state):
+        self.__init__()
+        for category, counts in state['sentiment_counts'].items():
+            self.sentiment_counts[category].update(counts)
+        for category, per_sentiment in state['aspect_counts'].items():
+            for sentiment, counts in per_sentiment.items():
+                self.aspect_counts[category][sentiment].update(counts)
+        self.rows = state['rows']
+
+
+# Ukuran bucket waktu (detik) untuk agregat tren
+BUCKET_SECONDS = {'hour': 3600, 'day': 86400}
+
+
+# Agregat tren: jumlah aspek per kategori x bucket waktu (jam dan hari) x aspek x sentimen.
+# Bucket di-roll saat baris masuk (add), jadi query jendela waktu hanya membaca bucket
+# dalam rentang itu - tidak pernah scan ulang tweet mentah.
+# Struktur: buckets[freq][kategori][awal_bucket] = Counter{(aspek, sentimen): n}
+class TrendAggregates:
+    def __init__(self):
+        self.buckets = {freq: {} for freq in BUCKET_SECONDS}
+
+    @classmethod
+    def from_table(cls, df, aspect_table):
+        trends = cls()
+        row_ids = aspect_table['row_id'].to_numpy()
+        created = df['created'].to_numpy()[row_ids]
+        for freq, size in BUCKET_SECONDS.items():
+            long_table = pd.DataFrame({
+                'Kategori': df['Kategori'].to_numpy()[row_ids],
+                'bucket': (created // size * size).astype('int64'),
+                'aspect': aspect_table['aspect'].to_numpy(),
+                'Sentiment': df['Sentiment'].to_numpy()[row_ids],
+            })
+            sizes = long_table.groupby(['Kategori', 'bucket', 'aspect', 'Sentiment'], sort=False, observed=True).size()
+            per_category = trends.buckets[freq]
+            for (category, bucket, aspect, sentiment), n in sizes.items():
+                per_category.setdefault(category, {}).setdefault(int(bucket), Counter())[(aspect, sentiment)] += int(n)
+        return trends
+
+    def add(self, category, sentiment, aspects, created):
+        if not aspects:
+            return
+        for freq, size in BUCKET_SECONDS.items():
+            bucket = int(created // size * size)
+            counts = self.buckets[freq].setdefault(category, {}).setdefault(bucket, Counter())
+            for aspect in aspects:
+                counts[(aspect, sentiment)] += 1
+
+    def merge(self, other):
+        for freq, per_category in other.buckets.items():
+            for category, per_bucket in per_category.items():
+                target = self.buckets[freq].setdefault(category, {})
+                for bucket, counts in per_bucket.items():
+                    target.setdefault(bucket, Counter()).update(counts)
+        return self
+
+    # Bucket kategori dalam [start, end); start/end None = tanpa batas
+    def window(self, category, start=None, end=None, freq='day'):
+        per_bucket = self.buckets[freq].get(category, {})
+        if start is None and end is None:
+            return sorted(per_bucket.items())
+        size = BUCKET_SECONDS[freq]
+        first = int(start // size * size) if start is not None else min(per_bucket, default=0)
+        last = end if end is not None else max(per_bucket, default=0) + size
+        # Iterasi per bucket dalam rentang (bukan per key), jadi biaya ~ panjang jendela
+        if (last - first) // size <= len(per_bucket):
+            buckets = range(first, int(last), size)
+            return [(bucket, per_bucket[bucket]) for bucket in buckets if bucket in per_bucket]
+        return sorted((bucket, counts) for bucket, counts in per_bucket.items() if first <= bucket < last)
+
+    # Total aspek (semua sentimen) dalam jendela waktu, untuk tabel Tren Aspek
+    def top_aspects(self, category, start=None, end=None, freq='day'):
+        totals = Counter()
+        for _, counts in self.window(category, start, end, freq):
+            for (aspect, _), n in counts.items():
+                totals[aspect] += n
+        return totals
+
+    # Deret waktu untuk chart: DataFrame (waktu, Aspek, Frekuensi) untuk aspek tertentu
+    def series(self, category, aspects, start=None, end=None, freq='day'):
+        aspects = set(aspects)
+        records = []
+        for bucket, counts in self.window(category, start, end, freq):
+            totals = Counter()
+            for (aspect, _), n in counts.items():
+                if aspect in aspects:
+                    totals[aspect] += n
+            records.extend((bucket, aspect, n) for aspect, n in totals.items())
+        frame = pd.DataFrame(records, columns=['bucket', 'Aspek', 'Frekuensi'])
+        frame['Waktu'] = pd.to_datetime(frame['bucket'], unit='s')
+        return frame[['Waktu', 'Aspek', 'Frekuensi']]
@@ -0,0 +1,108 @@
+"""Backend inference untuk model sentimen (CPU).
+
+- "torch": BertForSequenceClassification fp32 biasa
+- "int8":  dynamic quantization int8 pada layer Linear (torch.ao.quantization)
+- "onnx":  model di-export ke ONNX lalu dijalankan dengan onnxruntime
+
+Semua backend mengembalikan objek yang bisa dipanggil seperti model HuggingFace
+(`model(**inputs).logits`), jadi analyze_sentiment / analyze_sentiment_batch
+tidak perlu tahu backend mana yang dipakai.
+"""
+import hashlib
+import inspect
+import os
+from types import SimpleNamespace
+
+import torch
+
+BACKENDS = ("torch", "int8", "onnx")
+ONNX_CACHE_DIR = os.path.join(".cache", "onnx")
+
+
+def quantize_int8(model):
+    return torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8).eval()
+
+
+def export_onnx(tokenizer, model, path):
+    # Dua teks beda panjang supaya attention mask berisi padding saat tracing
+    # (kalau mask semua 1, jalur masking bisa hilang dari graph hasil export)
+    dummy = tokenizer(["contoh teks untuk export ke onnx", "pendek"], padding=True, return_tensors="pt")
+    # Exporter memberi nama input sesuai urutan argumen forward(), bukan urutan dict tokenizer
+    input_names = [name for name in inspect.signature(model.forward).parameters if name in dummy]
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes["logits"] = {0: "batch"}
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with torch.inference_mode():
+        torch.onnx.export(
+            model,
+            (),
+            path,
+            kwargs={name: dummy[name] for name in input_names},
+            input_names=input_names,
+            output_names=["logits"],
+            dynamic_axes=dynamic_axes,
+            opset_version=17,
+            dynamo=False,
+        )
+    return path
+
+
+# Wrapper onnxruntime dengan interface seperti model HuggingFace
+class OnnxSequenceClassifier:
+    def __init__(self, path, num_threads=None):
+        try:
+            import onnxruntime as ort
+        except ImportError as e:
+            raise ImportError("Backend 'onnx' butuh onnxruntime: pip install onnxruntime onnx") from e
+
+        options = ort.SessionOptions()
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+        self.session = ort.InferenceSession(path, options, providers=["CPUExecutionProvider"])
+        self.input_names = [i.name for i in self.session.get_inputs()]
+
+    def __call__(self, **inputs):
+        feeds = {name: inputs[name].numpy() for name in self.input_names if name in inputs}
+        logits = self.session.run(["logits"], feeds)[0]
+        return SimpleNamespace(logits=torch.from_numpy(logits))
+
+    def eval(self):
+        return self
+
+
+# Identitas bobot untuk key cache ONNX: mtime/ukuran file kalau model_name folder lokal,
+# commit hash revisi kalau dari hub, hash state_dict kalau dua-duanya tidak ada.
+# Tanpa ini model yang di-fine-tune ulang di path yang sama tetap memakai export lama.
+def _model_fingerprint(model_name, model):
+    if os.path.isdir(model_name):
+        stats = [os.stat(os.path.join(model_name, f)) for f in sorted(os.listdir(model_name))]
+        key = repr([(s.st_size, s.st_mtime_ns) for s in stats])
+    else:
+        key = getattr(model.config, "_commit_hash", None)
+    if not key:
+        digest = hashlib.sha1()
+        for name, tensor in model.state_dict().items():
+            digest.update(name.encode())
+            digest.update(tensor.detach().cpu().numpy().tobytes())
+        return digest.hexdigest()[:12]
+    return hashlib.sha1(key.encode()).hexdigest()[:12]
+
+
+def _onnx_path(model_name, model):
+    filename = f"{model_name.strip('/').replace('/', '__')}-{_model_fingerprint(model_name, model)}.onnx"
+    return os.path.join(ONNX_CACHE_DIR, filename)
+
+
+# Bangun backend dari model fp32 yang sudah di-load
+def build_backend(tokenizer, model, backend="torch", model_name="model"):
+    if backend == "torch":
+        return model
+    if backend == "int8":
+        return quantize_int8(model)
+    if backend == "onnx":
+        path = _onnx_path(model_name, model)
+        if not os.path.exists(path):
+            export_onnx(tokenizer, model, path)
+        return OnnxSequenceClassifier(path, num_threads=torch.get_num_threads())
+    raise ValueError(f"Backend tidak dikenal: {backend!r} (pilih salah satu dari {BACKENDS})")
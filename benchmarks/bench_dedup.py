@@ -0,0 +1,73 @@
+"""Dedup sebelum scoring: rasio duplikat, waktu clustering, dan waktu label dengan/tanpa dedup.
+
+Jalankan dari root repo:
+    python benchmarks/bench_dedup.py
+    python benchmarks/bench_dedup.py --csv trial_df.csv final_df.csv --retweets 0.3
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from dedup import DuplicateIndex
+from relabel import label_frame
+from sentiment import MODEL_NAME, load_model
+from tiny_model import resolve_model
+
+
+# Tambahkan retweet sintetis ("RT @akun: ..." + URL t.co baru) untuk porsi baris tertentu
+def add_retweets(df, fraction, seed=0):
+    rng = np.random.RandomState(seed)
+    picked = df.sample(frac=fraction, random_state=seed)
+    retweets = picked.assign(Tweet=[
+        f"RT @akun{rng.randint(1000)}: {tweet} https://t.co/{rng.randint(1 << 30):x}" for tweet in picked['Tweet']
+    ])
+    return pd.concat([df, retweets], ignore_index=True).sample(frac=1, random_state=seed).reset_index(drop=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--csv', nargs='+', default=[os.path.join(ROOT, 'trial_df.csv')])
+    parser.add_argument('--retweets', type=float, default=0.0, help="Porsi baris yang ditambah retweet sintetis")
+    parser.add_argument('--model', default=MODEL_NAME)
+    parser.add_argument('--batch-size', type=int, default=32)
+    args = parser.parse_args(argv)
+
+    df = pd.concat([pd.read_csv(path) for path in args.csv], ignore_index=True)[['Kategori', 'Tweet']]
+    if args.retweets:
+        df = add_retweets(df, args.retweets)
+    texts = df['Tweet'].astype(str).tolist()
+
+    start = time.perf_counter()
+    index = DuplicateIndex()
+    index.cluster_keys(texts)
+    elapsed = time.perf_counter() - start
+    stats = index.stats()
+    print(f"{len(texts)} tweet -> {stats['clusters']} cluster ({1 - stats['clusters'] / len(texts):.1%} duplikat, "
+          f"{stats['near_duplicates']} near-duplicate) | clustering {elapsed:.2f}s")
+
+    model_name, stand_in = resolve_model(args.model)
+    tokenizer, model = load_model(model_name)
+    print(f"model {model_name}{' (stand-in)' if stand_in else ''}")
+
+    results = {}
+    for dedup in (False, True):
+        start = time.perf_counter()
+        results[dedup] = label_frame(df, tokenizer, model, batch_size=args.batch_size, dedup=dedup)
+        elapsed = time.perf_counter() - start
+        print(f"dedup {str(dedup):5s}: {elapsed:7.2f}s  {len(df) / elapsed:8.1f} baris/s")
+
+    # Anggota cluster ikut label wakilnya; selisih dengan label per baris = biaya dedup
+    same = (results[True]['Sentiment'] == results[False]['Sentiment']).mean()
+    print(f"label sentimen sama dengan scoring per baris: {same:.2%}")
+
+
+if __name__ == '__main__':
+    main()
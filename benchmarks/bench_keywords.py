@@ -0,0 +1,84 @@
+"""Bandingkan nested loop lama, matcher Aho-Corasick (substring) dan matcher n-gram kata
+pada tweet CSV: waktu, plus presisi/recall aspek terhadap kolom `problem` berlabel.
+
+Jalankan dari root repo:  python benchmarks/bench_keywords.py
+"""
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from keywords import KeywordMatcher, TokenMatcher, good_keywords, problem_keywords
+from problems import preprocess_problems
+
+
+# Implementasi lama (satu substring scan per keyword per aspek)
+def naive_detect(text, keyword_dict):
+    detected = []
+    text_lower = text.lower()
+
+    for aspect, keywords in keyword_dict.items():
+        for keyword in keywords:
+            if keyword in text_lower:
+                detected.append(aspect)
+                break
+
+    return list(set(detected))
+
+
+def timed(func, texts, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        results = [func(text) for text in texts]
+        best = min(best, time.perf_counter() - start)
+    return best, results
+
+
+# Presisi/recall aspek hasil deteksi terhadap label (micro-average per pasangan tweet-aspek)
+def precision_recall(results, labels):
+    tp = fp = fn = 0
+    for found, label in zip(results, labels):
+        found, label = set(found), set(label)
+        tp += len(found & label)
+        fp += len(found - label)
+        fn += len(label - found)
+    return tp / max(tp + fp, 1), tp / max(tp + fn, 1)
+
+
+def main(repeat=5):
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    texts = []
+    for name in ("trial_df.csv", "final_df.csv"):
+        texts.extend(pd.read_csv(os.path.join(root, name))['Tweet'].astype(str).tolist())
+
+    print(f"{len(texts)} tweet, best of {repeat}")
+    for label, keyword_dict in (("problem", problem_keywords), ("good", good_keywords)):
+        automaton, tokens = KeywordMatcher(keyword_dict), TokenMatcher(keyword_dict)
+        naive_time, naive_results = timed(lambda t: naive_detect(t, keyword_dict), texts, repeat)
+        fast_time, fast_results = timed(lambda t: automaton.match_list(t.lower()), texts, repeat)
+        token_time, token_results = timed(tokens.match_list, texts, repeat)
+
+        mismatches = sum(set(a) != set(b) for a, b in zip(naive_results, fast_results))
+        changed = sum(set(a) != set(b) for a, b in zip(naive_results, token_results))
+        print(
+            f"{label:8s} nested loop {naive_time * 1000:8.1f} ms | "
+            f"automaton {fast_time * 1000:8.1f} ms (mismatches {mismatches}) | "
+            f"n-gram {token_time * 1000:8.1f} ms (hasil berubah {changed})"
+        )
+
+    # Kolom `problem` di trial_df.csv berisi aspek dari problem_keywords
+    labelled = pd.read_csv(os.path.join(root, "trial_df.csv"))
+    labelled_texts = labelled['Tweet'].astype(str).tolist()
+    labels = [preprocess_problems(p) for p in labelled['problem']]
+    print(f"\nPresisi/recall terhadap kolom problem ({len(labels)} tweet berlabel)")
+    for name, matcher in (("substring", KeywordMatcher(problem_keywords)), ("n-gram", TokenMatcher(problem_keywords))):
+        precision, recall = precision_recall([matcher.match(t.lower()) for t in labelled_texts], labels)
+        print(f"{name:10s} presisi {precision:6.1%}  recall {recall:6.1%}")
+
+
+if __name__ == "__main__":
+    main()
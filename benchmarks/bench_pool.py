@@ -0,0 +1,68 @@
+"""Skalabilitas relabel.py --workers: throughput per jumlah worker.
+
+Jalankan dari root repo:
+    python benchmarks/bench_pool.py
+    python benchmarks/bench_pool.py --scale 20 --workers 1,2,4,8,16,32
+"""
+import argparse
+import filecmp
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from relabel import relabel
+from sentiment import MODEL_NAME, load_model
+from tiny_model import resolve_model
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--csv', default=os.path.join(ROOT, 'trial_df.csv'))
+    parser.add_argument('--scale', type=int, default=10, help="Faktor perbanyakan baris CSV")
+    parser.add_argument('--workers', default=None, help="Daftar jumlah worker, dipisah koma")
+    parser.add_argument('--chunk-size', type=int, default=500)
+    parser.add_argument('--model', default=MODEL_NAME)
+    args = parser.parse_args(argv)
+
+    cores = os.cpu_count() or 1
+    worker_counts = [int(w) for w in args.workers.split(',')] if args.workers else sorted(
+        {1, 2, 4, 8, 16, 32, cores} & set(range(1, cores + 1))
+    )
+    model_name, stand_in = resolve_model(args.model)
+
+    workdir = tempfile.mkdtemp(prefix='bench-pool-')
+    source = pd.read_csv(args.csv)[['Kategori', 'Tweet']]
+    input_path = os.path.join(workdir, 'tweets.csv')
+    pd.concat([source] * args.scale, ignore_index=True).to_csv(input_path, index=False)
+    rows = len(source) * args.scale
+    print(f"{rows} baris, {cores} core, model {model_name}{' (stand-in)' if stand_in else ''}")
+
+    baseline = None
+    for workers in worker_counts:
+        output_path = os.path.join(workdir, f'out_{workers}.csv')
+        start = time.perf_counter()
+        if workers == 1:
+            tokenizer, model = load_model(model_name)
+            relabel(input_path, output_path, tokenizer, model, chunk_size=args.chunk_size, resume=False)
+        else:
+            relabel(input_path, output_path, None, None, chunk_size=args.chunk_size, resume=False,
+                    workers=workers, model_name=model_name)
+        elapsed = time.perf_counter() - start
+
+        throughput = rows / elapsed
+        baseline = baseline or throughput
+        # Output harus sama persis dengan versi satu proses (urutan dan label)
+        same = filecmp.cmp(output_path, os.path.join(workdir, f'out_{worker_counts[0]}.csv'), shallow=False)
+        print(f"workers {workers:3d}: {elapsed:8.2f}s  {throughput:9.1f} baris/s  speedup {throughput / baseline:5.2f}x"
+              f"  efisiensi {throughput / baseline / workers:5.0%}  output sama: {same}")
+
+
+if __name__ == '__main__':
+    main()
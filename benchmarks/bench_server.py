@@ -0,0 +1,88 @@
+"""Latency inference dengan banyak pengguna bersamaan: panggilan langsung per sesi vs server micro-batching.
+
+Setiap client (thread) mengirim request satu per satu, seperti analis yang menekan
+"Analisis Komentar". Mode "direct" memanggil analyze_sentiment pada model bersama dari
+setiap thread; mode "server" lewat BatchingInferenceServer.
+
+Jalankan dari root repo:
+    python benchmarks/bench_server.py
+    python benchmarks/bench_server.py --clients 1,4,16,32 --requests 20 --window-ms 5
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from inference_server import BatchingInferenceServer
+from sentiment import MODEL_NAME, analyze_sentiment, load_model
+from tiny_model import resolve_model
+
+
+# Jalankan client bersamaan; hasil = (latency per request dalam ms, durasi total detik)
+def run_clients(clients, requests, texts, analyze):
+    latencies = [[] for _ in range(clients)]
+    barrier = threading.Barrier(clients + 1)
+
+    def client(index):
+        rng = np.random.RandomState(index)
+        barrier.wait()
+        for _ in range(requests):
+            text = texts[rng.randint(len(texts))]
+            start = time.perf_counter()
+            analyze(text)
+            latencies[index].append((time.perf_counter() - start) * 1000)
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    return np.concatenate([np.array(values) for values in latencies]), time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--csv', default=os.path.join(ROOT, 'trial_df.csv'))
+    parser.add_argument('--clients', default='1,4,16', help="Jumlah client bersamaan, dipisah koma")
+    parser.add_argument('--requests', type=int, default=20, help="Request per client")
+    parser.add_argument('--max-batch', type=int, default=16)
+    parser.add_argument('--window-ms', type=float, default=5.0)
+    parser.add_argument('--model', default=MODEL_NAME)
+    args = parser.parse_args(argv)
+
+    texts = pd.read_csv(args.csv)['Tweet'].astype(str).tolist()
+    model_name, stand_in = resolve_model(args.model)
+    tokenizer, model = load_model(model_name)
+    print(f"model {model_name}{' (stand-in)' if stand_in else ''}, {os.cpu_count()} core\n")
+
+    for clients in [int(c) for c in args.clients.split(',')]:
+        for mode in ('direct', 'server'):
+            server = None
+            if mode == 'direct':
+                analyze = lambda text: analyze_sentiment(text, tokenizer, model)
+            else:
+                server = BatchingInferenceServer(lambda: (tokenizer, model), max_batch_size=args.max_batch,
+                                                 batch_window=args.window_ms / 1000).start()
+                analyze = server.analyze
+            latencies, elapsed = run_clients(clients, args.requests, texts, analyze)
+            p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+            print(f"clients {clients:3d} {mode:6s}: p50 {p50:7.1f} ms  p95 {p95:7.1f} ms  p99 {p99:7.1f} ms"
+                  f"  {len(latencies) / elapsed:7.1f} req/s")
+            if server is not None:
+                stats = server.stats()
+                server.stop()
+                print(f"    batch rata-rata {stats['mean_batch_size']:.1f}, ukuran batch {stats['batch_sizes']}")
+
+
+if __name__ == '__main__':
+    main()
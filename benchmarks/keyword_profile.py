@@ -0,0 +1,61 @@
+"""Profil hit per keyword di dataset: keyword mati (tidak pernah cocok) dan keyword yang
+terlalu sering cocok, sebagai dasar memangkas data/good_keywords.json / data/problem_keywords.json.
+
+Jalankan dari root repo:
+    python benchmarks/keyword_profile.py
+    python benchmarks/keyword_profile.py --top 30 --output profil_keyword.csv
+"""
+import argparse
+import os
+import sys
+
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from keywords import good_keywords, good_matcher, keyword_hits, problem_keywords, problem_matcher
+
+
+def profile(texts, keyword_dict, matcher):
+    hits = keyword_hits(texts, matcher)
+    rows = []
+    for aspect, keywords in keyword_dict.items():
+        for keyword in dict.fromkeys(keywords):
+            # Keyword duplikat setelah normalisasi berbagi hit dengan keyword kanoniknya
+            rows.append({'aspek': aspect, 'keyword': keyword, 'hits': hits.get((aspect, matcher.canonical(keyword)), 0)})
+    frame = pd.DataFrame(rows)
+    frame['persen_tweet'] = frame['hits'] / max(len(texts), 1) * 100
+    return frame
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--csv', nargs='+', default=[os.path.join(ROOT, 'trial_df.csv'), os.path.join(ROOT, 'final_df.csv')])
+    parser.add_argument('--top', type=int, default=15, help="Jumlah keyword paling sering cocok yang ditampilkan")
+    parser.add_argument('--output', default=None, help="Simpan profil lengkap ke CSV")
+    args = parser.parse_args(argv)
+
+    texts = []
+    for path in args.csv:
+        texts.extend(pd.read_csv(path)['Tweet'].astype(str).tolist())
+    print(f"{len(texts)} tweet")
+
+    frames = []
+    for label, keyword_dict, matcher in (
+        ("problem", problem_keywords, problem_matcher),
+        ("good", good_keywords, good_matcher),
+    ):
+        frame = profile(texts, keyword_dict, matcher).assign(dictionary=label)
+        frames.append(frame)
+        dead = frame[frame['hits'] == 0]
+        print(f"\n[{label}] {len(frame)} keyword, {len(dead)} tidak pernah cocok ({len(dead) / len(frame):.0%})")
+        print(frame.nlargest(args.top, 'hits').to_string(index=False, float_format='%.1f'))
+
+    if args.output:
+        pd.concat(frames, ignore_index=True).to_csv(args.output, index=False)
+        print(f"\nProfil lengkap disimpan di {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""Parity check backend int8 / onnx terhadap baseline fp32 pada tweet CSV.
+
+Jalankan dari root repo:
+    python benchmarks/parity_backends.py
+    python benchmarks/parity_backends.py --model path/ke/model_lokal --limit 500
+"""
+import argparse
+import os
+import sys
+import time
+
+import pandas as pd
+import torch
+from transformers import BertForSequenceClassification, BertTokenizer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from backends import BACKENDS, build_backend
+from sentiment import MODEL_NAME, analyze_sentiment_batch
+from tiny_model import resolve_model
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--model', default=MODEL_NAME)
+    parser.add_argument('--csv', default=os.path.join(ROOT, 'trial_df.csv'))
+    parser.add_argument('--limit', type=int, default=None)
+    parser.add_argument('--batch-size', type=int, default=32)
+    args = parser.parse_args(argv)
+
+    model_name, stand_in = resolve_model(args.model)
+    texts = pd.read_csv(args.csv)['Tweet'].astype(str).tolist()[:args.limit]
+    tokenizer = BertTokenizer.from_pretrained(model_name)
+    base_model = BertForSequenceClassification.from_pretrained(model_name).eval()
+
+    print(f"{len(texts)} tweet, {torch.get_num_threads()} thread, model {model_name}{' (stand-in)' if stand_in else ''}")
+    baseline = None
+    for backend in BACKENDS:
+        try:
+            model = build_backend(tokenizer, base_model, backend, model_name)
+        except ImportError as e:
+            print(f"{backend:6s} dilewati: {e}")
+            continue
+
+        start = time.perf_counter()
+        results = analyze_sentiment_batch(texts, tokenizer, model, batch_size=args.batch_size)
+        elapsed = time.perf_counter() - start
+
+        line = f"{backend:6s} {elapsed:7.2f}s ({len(texts) / elapsed:7.1f} tweet/s)"
+        if baseline is None:
+            baseline = results
+        else:
+            agreement = sum(a[0] == b[0] for a, b in zip(results, baseline)) / len(texts)
+            # Drift confidence dibandingkan pada probabilitas kelas Positif supaya label beda tetap sebanding
+            drift = [
+                abs((a[1] if a[0] == 'Positif' else 1 - a[1]) - (b[1] if b[0] == 'Positif' else 1 - b[1]))
+                for a, b in zip(results, baseline)
+            ]
+            line += f" | label agreement {agreement:.2%} | drift mean {sum(drift) / len(drift):.4f} max {max(drift):.4f}"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
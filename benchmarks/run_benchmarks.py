@@ -0,0 +1,207 @@
+"""Benchmark pipeline analisis end to end (headless, offline).
+
+Stage yang diukur per skala data (1x, 10x, 100x baris CSV):
+  analyze_sentiment      per teks (latency) dan analyze_sentiment_batch (throughput)
+  lexicon_batch          fallback lexicon (tanpa model) untuk satu batch penuh
+  detect_problems        per teks
+  detect_good_aspects    per teks
+  preprocess_problems    apply per baris dan explode_problems (vectorized)
+  load_data              seluruh korpus lewat cache partisi (dataset.load_dataset), cold dan warm
+  load_partition         satu kategori lewat dataset.load_partition (jalur load dashboard), warm
+  render                 rerun penuh deepseek.py lewat streamlit.testing (kategori aktif;
+                         DASHBOARD_NAV=tabs untuk merender ketiga tab)
+
+Contoh:
+    python benchmarks/run_benchmarks.py
+    python benchmarks/run_benchmarks.py --scales 1,10,100 --output hasil.json
+    python benchmarks/run_benchmarks.py --compare benchmarks/results/abc123.json
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from dataset import load_dataset, load_partition, partition_counts
+from keywords import detect_good_aspects, detect_problems
+from problems import explode_problems, preprocess_problems
+from sentiment import MODEL_NAME, analyze_sentiment, analyze_sentiment_batch, load_model
+from tiny_model import resolve_model
+
+
+def percentile(values, q):
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method='inclusive')[q - 1]
+
+
+# Jalankan satu stage: latency per panggilan, throughput = total item semua panggilan / total waktu.
+# Peak memori Python (tracemalloc) diukur di pass terpisah supaya overhead-nya tidak ikut ke waktu.
+def measure(stage, scale, items, calls, memory=True):
+    calls = list(calls)
+    latencies = []
+    start = time.perf_counter()
+    for call in calls:
+        t = time.perf_counter()
+        call()
+        latencies.append(time.perf_counter() - t)
+    total = time.perf_counter() - start
+
+    peak = 0
+    if memory:
+        tracemalloc.start()
+        for call in calls:
+            call()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    result = {
+        'stage': stage,
+        'scale': scale,
+        'items': items,
+        'seconds': total,
+        'throughput': items / total if total else float('inf'),
+        'p50_ms': percentile(latencies, 50) * 1000,
+        'p95_ms': percentile(latencies, 95) * 1000,
+        'peak_python_mb': peak / 2 ** 20,
+        'max_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+    print(
+        f"{stage:28s} x{scale:<4d} {items:>8d} item  {result['throughput']:>10.1f}/s  "
+        f"p50 {result['p50_ms']:8.2f} ms  p95 {result['p95_ms']:8.2f} ms  peak {result['peak_python_mb']:7.1f} MB"
+    )
+    return result
+
+
+def scaled_frame(base, scale):
+    return pd.concat([base] * scale, ignore_index=True) if scale > 1 else base
+
+
+def run_render(csv_path, scale, repeats):
+    from streamlit.testing.v1 import AppTest
+
+    os.environ['DASHBOARD_DATA'] = csv_path
+    os.environ.setdefault('HF_HUB_OFFLINE', '1')
+    app = AppTest.from_file(os.path.join(ROOT, 'deepseek.py'), default_timeout=600)
+    app.run()  # Run pertama: load data + bangun agregat
+    if app.exception:
+        raise RuntimeError(app.exception[0].value)
+    return measure('render (rerun)', scale, repeats, [app.run for _ in range(repeats)])
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, text=True).strip()
+    except Exception:
+        return 'unknown'
+
+
+def compare(results, baseline_path):
+    with open(baseline_path) as f:
+        baseline = {(r['stage'], r['scale']): r for r in json.load(f)['results']}
+    print(f"\nPerbandingan throughput terhadap {baseline_path}:")
+    for r in results:
+        old = baseline.get((r['stage'], r['scale']))
+        if old:
+            print(f"{r['stage']:28s} x{r['scale']:<4d} {r['throughput'] / old['throughput']:6.2f}x")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark pipeline analisis sentimen")
+    parser.add_argument('--csv', default=os.path.join(ROOT, 'trial_df.csv'))
+    parser.add_argument('--scales', default='1,10,100', help="Faktor perbanyakan baris, dipisah koma")
+    parser.add_argument('--model', default=MODEL_NAME)
+    parser.add_argument('--latency-samples', type=int, default=200, help="Jumlah teks untuk latency per-teks model")
+    parser.add_argument('--render-repeats', type=int, default=5)
+    parser.add_argument('--skip-render', action='store_true')
+    parser.add_argument('--output', default=None, help="File JSON hasil (default benchmarks/results/<commit>.json)")
+    parser.add_argument('--compare', default=None, help="File JSON hasil sebelumnya untuk dibandingkan")
+    args = parser.parse_args(argv)
+
+    model_name, stand_in = resolve_model(args.model)
+    tokenizer, model = load_model(model_name)
+    print(f"model: {model_name}{' (stand-in offline)' if stand_in else ''}\n")
+
+    base = pd.read_csv(args.csv)
+    results = []
+    workdir = tempfile.mkdtemp(prefix='bench-')
+    try:
+        for scale in [int(s) for s in args.scales.split(',')]:
+            frame = scaled_frame(base, scale)
+            texts = frame['Tweet'].astype(str).tolist()
+            problems = frame['problem']
+            sample = texts[:args.latency_samples]
+
+            results.append(measure('analyze_sentiment', scale, len(sample),
+                                   [lambda t=t: analyze_sentiment(t, tokenizer, model) for t in sample]))
+            results.append(measure('analyze_sentiment_batch', scale, len(texts),
+                                   [lambda: analyze_sentiment_batch(texts, tokenizer, model, batch_size=64)]))
+            results.append(measure('lexicon_batch', scale, len(texts),
+                                   [lambda: analyze_sentiment_batch(texts, None, None)]))
+            results.append(measure('detect_problems', scale, len(texts),
+                                   [lambda t=t: detect_problems(t) for t in texts]))
+            results.append(measure('detect_good_aspects', scale, len(texts),
+                                   [lambda t=t: detect_good_aspects(t) for t in texts]))
+            results.append(measure('preprocess_problems', scale, len(problems),
+                                   [lambda p=p: preprocess_problems(p) for p in problems]))
+            results.append(measure('explode_problems', scale, len(problems),
+                                   [lambda: explode_problems(problems)]))
+
+            csv_path = os.path.join(workdir, f'tweets_x{scale}.csv')
+            frame.to_csv(csv_path, index=False)
+            cache_dir = os.path.join(workdir, f'cache_x{scale}')
+            results.append(measure('load_data (cold)', scale, 3 * len(frame), [
+                lambda: (shutil.rmtree(cache_dir, ignore_errors=True), load_dataset(csv_path, cache_dir))
+                for _ in range(3)
+            ]))
+            results.append(measure('load_data (warm)', scale, 3 * len(frame),
+                                   [lambda: load_dataset(csv_path, cache_dir) for _ in range(3)]))
+            # Dashboard hanya membaca partisi kategori yang dilihat
+            counts = partition_counts([csv_path], cache_dir)
+            results.append(measure('load_partition (warm)', scale, 3 * sum(counts.values()), [
+                lambda category=category: load_partition([csv_path], category, cache_dir)
+                for category in counts for _ in range(3)
+            ]))
+
+            if not args.skip_render:
+                results.append(run_render(csv_path, scale, args.render_repeats))
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    commit = git_commit()
+    report = {
+        'meta': {
+            'commit': commit,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'model': model_name,
+            'model_stand_in': stand_in,
+        },
+        'results': results,
+    }
+    output = args.output or os.path.join(ROOT, 'benchmarks', 'results', f'{commit}.json')
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nHasil disimpan di {output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+"""Model pengganti kecil untuk benchmark offline.
+
+Kalau bobot HuggingFace asli sudah ada di cache lokal, itu yang dipakai.
+Kalau tidak, dibuat BERT acak berukuran kecil (vocab dari tweet CSV) supaya
+pipeline tetap bisa diukur tanpa internet. Angka akurasinya tidak berarti,
+tapi bentuk komputasinya (tokenisasi, padding, forward pass) tetap sama.
+"""
+import os
+import string
+
+import pandas as pd
+import torch
+from transformers import BertConfig, BertForSequenceClassification, BertTokenizer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TINY_MODEL_DIR = os.path.join(ROOT, ".cache", "tiny-bert")
+
+
+def build_tiny_model(path=TINY_MODEL_DIR, csv_path=os.path.join(ROOT, "trial_df.csv"), vocab_size=4000):
+    words = set()
+    for tweet in pd.read_csv(csv_path)['Tweet'].astype(str).str.lower():
+        words.update(tweet.split())
+    specials = ['[PAD]', '[UNK]', '[CLS]', '[SEP]', '[MASK]']
+    vocab = specials + list(string.ascii_lowercase + string.digits) + sorted(words)[:vocab_size]
+
+    os.makedirs(path, exist_ok=True)
+    with open(os.path.join(path, "vocab.txt"), "w", encoding="utf-8") as f:
+        f.write("\n".join(vocab))
+
+    torch.manual_seed(0)
+    config = BertConfig(
+        vocab_size=len(vocab), hidden_size=64, num_hidden_layers=2,
+        num_attention_heads=2, intermediate_size=128, num_labels=2,
+    )
+    BertTokenizer(os.path.join(path, "vocab.txt")).save_pretrained(path)
+    BertForSequenceClassification(config).save_pretrained(path)
+    return path
+
+
+# Kembalikan (nama_model, is_stand_in)
+def resolve_model(model_name):
+    try:
+        BertTokenizer.from_pretrained(model_name, local_files_only=True)
+        BertForSequenceClassification.from_pretrained(model_name, local_files_only=True)
+        return model_name, False
+    except Exception:
+        if not os.path.exists(os.path.join(TINY_MODEL_DIR, "config.json")):
+            build_tiny_model()
+        return TINY_MODEL_DIR, True
@@ -0,0 +1,108 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+import plotly.express as px
+
+
+# Hash isi data yang diplot (baris label..., jumlah), bagian dari key cache figure
+def counts_hash(items):
+    payload = json.dumps([[str(label) for label in item[:-1]] + [int(item[-1])] for item in items])
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()[:12]
+
+
+# Layout bersama semua chart dashboard (latar transparan mengikuti tema halaman)
+def apply_layout(fig, **layout):
+    fig.update_layout(
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(color='var(--text-color)'),
+        **layout
+    )
+    return fig
+
+
+# Bar horizontal top aspek: merah untuk masalah (Negatif), hijau untuk aspek positif
+def bar_figure(category_name, sentiment, top_items):
+    if sentiment == 'Negatif':
+        title, scale = f'Top 5 Masalah {category_name} (Sentimen Negatif)', 'reds'
+    else:
+        title, scale = f'Top 5 Aspek Positif {category_name}', 'greens'
+
+    fig = px.bar(
+        pd.DataFrame(top_items, columns=['Aspek', 'Count']),
+        x='Count',
+        y='Aspek',
+        orientation='h',
+        title=title,
+        color='Count',
+        color_continuous_scale=scale
+    )
+    return apply_layout(fig, showlegend=False, yaxis={'categoryorder': 'total ascending'})
+
+
+# Pie distribusi sentimen - HANYA Positif & Negatif
+def pie_figure(category_name, sentiment_items):
+    names = [label for label, _ in sentiment_items]
+    fig = px.pie(
+        values=[count for _, count in sentiment_items],
+        names=names,
+        title=f'Distribusi Sentimen {category_name}',
+        color=names,
+        color_discrete_map={
+            'Positif': '#28a745',
+            'Negatif': '#dc3545'
+            # Tidak ada Netral
+        }
+    )
+    return apply_layout(fig)
+
+
+# Garis jumlah aspek per bucket waktu (jam/hari) untuk beberapa aspek teratas
+def trend_figure(category_name, series, freq):
+    fig = px.line(
+        series,
+        x='Waktu',
+        y='Frekuensi',
+        color='Aspek',
+        markers=True,
+        title=f'Tren Aspek {category_name} per {"jam" if freq == "hour" else "hari"}'
+    )
+    return apply_layout(fig, legend=dict(orientation='h', yanchor='top', y=-0.2))
+
+
+# Cache figure Plotly yang dipakai bersama semua sesi.
+# Key = (jenis chart, kategori, hash data yang diplot, tema), jadi figure hanya
+# dibangun ulang kalau jumlahnya berubah. Figure tidak diubah setelah dibangun
+# (st.plotly_chart hanya membaca), jadi aman dipakai banyak sesi sekaligus.
+class FigureCache:
+    def __init__(self, max_entries=64):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.builds = 0
+        self._lock = threading.Lock()
+
+    def get(self, kind, category, items, theme, build):
+        key = (kind, category, counts_hash(items), theme)
+        with self._lock:
+            fig = self.entries.get(key)
+            if fig is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return fig
+
+        fig = build()
+        with self._lock:
+            self.builds += 1
+            self.entries[key] = fig
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        return fig
+
+    def stats(self):
+        with self._lock:
+            return {'size': len(self.entries), 'hits': self.hits, 'builds': self.builds}
@@ -0,0 +1,229 @@
+import atexit
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+import keywords
+from dedup import DuplicateIndex
+from problems import preprocess_problems
+
+
+# Log komentar yang tahan restart dan dipakai bersama oleh semua sesi dan proses Streamlit
+# di satu node. SQLite mode WAL: banyak pembaca + satu penulis tanpa saling blok.
+# Tulis di-batch: append() hanya menaruh ke buffer, flush dilakukan thread background
+# setiap flush_interval detik atau saat buffer mencapai batch_size.
+class CommentLog:
+    def __init__(self, db_path, batch_size=50, flush_interval=1.0):
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.origin = uuid.uuid4().hex  # Identitas proses ini, supaya sync tidak membaca tulisan sendiri
+
+        self._db = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS comments (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                created REAL NOT NULL,
+                origin TEXT NOT NULL,
+                Kategori TEXT NOT NULL,
+                Tweet TEXT NOT NULL,
+                Sentiment TEXT NOT NULL,
+                problem TEXT NOT NULL,
+                session TEXT,
+                spans TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_comments_kategori_sentiment ON comments (Kategori, Sentiment);
+            CREATE INDEX IF NOT EXISTS idx_comments_kategori_id ON comments (Kategori, id);
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL);
+            INSERT OR IGNORE INTO meta VALUES ('generation', 0);
+            """
+        )
+        # Log lama (sebelum ada kolom session / spans): tambahkan kolomnya
+        existing = [column[1] for column in self._db.execute("PRAGMA table_info(comments)")]
+        for column in ('session', 'spans'):
+            if column not in existing:
+                self._db.execute(f"ALTER TABLE comments ADD COLUMN {column} TEXT")
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_comments_session ON comments (session)")
+        self._db.commit()
+
+        self._lock = threading.Lock()
+        self._pending = []
+        self._wakeup = threading.Event()
+        self._closed = False
+        self._flusher = threading.Thread(target=self._flush_loop, name="comment-log-flush", daemon=True)
+        self._flusher.start()
+        atexit.register(self.close)
+
+    def append(self, row):
+        spans = row.get('spans')
+        record = (
+            row.get('created', time.time()), self.origin, row['Kategori'], row['Tweet'],
+            row['Sentiment'], row.get('problem') or str(row.get('problems_clean', [])),
+            None if spans is None else json.dumps([list(span) for span in spans]), row.get('session'),
+        )
+        with self._lock:
+            self._pending.append(record)
+            if len(self._pending) >= self.batch_size:
+                self._wakeup.set()
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, []
+            if pending:
+                with self._db:
+                    self._db.executemany(
+                        "INSERT INTO comments (created, origin, Kategori, Tweet, Sentiment, problem, spans, session)"
+                        " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                        pending,
+                    )
+        return len(pending)
+
+    def _flush_loop(self):
+        while not self._closed:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+    def close(self):
+        if not self._closed:
+            self._closed = True
+            self._wakeup.set()
+            self.flush()
+
+    # Baris dengan id > last_id (opsional tanpa tulisan proses ini sendiri)
+    def read_since(self, last_id=0, include_own=True):
+        query = "SELECT id, created, origin, Kategori, Tweet, Sentiment, problem, session, spans FROM comments WHERE id > ?"
+        params = [last_id]
+        if not include_own:
+            query += " AND origin != ?"
+            params.append(self.origin)
+        with self._lock:
+            rows = self._db.execute(query + " ORDER BY id", params).fetchall()
+        return [
+            {'id': r[0], 'created': r[1], 'origin': r[2], 'Kategori': r[3], 'Tweet': r[4], 'Sentiment': r[5], 'problem': r[6],
+             'session': r[7], 'spans': None if r[8] is None else json.loads(r[8])}
+            for r in rows
+        ]
+
+    def last_id(self):
+        with self._lock:
+            return self._db.execute("SELECT COALESCE(MAX(id), 0) FROM comments").fetchone()[0]
+
+    # Query dashboard langsung ke SQLite (pakai index Kategori/Sentiment)
+    def counts(self, category=None):
+        query = "SELECT Kategori, Sentiment, COUNT(*) FROM comments"
+        params = []
+        if category is not None:
+            query += " WHERE Kategori = ?"
+            params.append(category)
+        with self._lock:
+            rows = self._db.execute(query + " GROUP BY Kategori, Sentiment", params).fetchall()
+        return {(kategori, sentiment): n for kategori, sentiment, n in rows}
+
+    def recent(self, category, n=8):
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT Tweet, Sentiment, problem FROM comments WHERE Kategori = ? ORDER BY id DESC LIMIT ?",
+                (category, n),
+            ).fetchall()
+        return [{'Tweet': t, 'Sentiment': s, 'problem': p} for t, s, p in rows]
+
+    # Generation naik setiap clear(); proses lain memakainya untuk tahu log sudah direset
+    def generation(self):
+        with self._lock:
+            return self._db.execute("SELECT value FROM meta WHERE key = 'generation'").fetchone()[0]
+
+    def clear(self):
+        with self._lock:
+            self._pending = []
+            with self._db:
+                self._db.execute("DELETE FROM comments")
+                self._db.execute("UPDATE meta SET value = value + 1 WHERE key = 'generation'")
+
+    # Hapus hanya baris yang ditambahkan satu sesi dashboard; baris sesi lain dan ingestion tetap.
+    # Generation tetap dinaikkan supaya mirror di semua proses dibangun ulang tanpa baris itu.
+    def clear_session(self, session):
+        with self._lock:
+            pending = len(self._pending)
+            self._pending = [record for record in self._pending if record[-1] != session]
+            deleted = pending - len(self._pending)
+            with self._db:
+                deleted += self._db.execute("DELETE FROM comments WHERE session = ?", (session,)).rowcount
+                if deleted:
+                    self._db.execute("UPDATE meta SET value = value + 1 WHERE key = 'generation'")
+        return deleted
+
+    def session_count(self, session):
+        with self._lock:
+            pending = sum(record[-1] == session for record in self._pending)
+            return pending + self._db.execute("SELECT COUNT(*) FROM comments WHERE session = ?", (session,)).fetchone()[0]
+
+
+# Mirror in-memory (CommentStore) dari log, dipakai bersama semua sesi di proses ini.
+# Tulisan sendiri langsung masuk store; tulisan proses lain ditarik lewat sync() per rerun.
+# Setiap baris diberi key cluster duplikat (dedup.py) untuk agregat "cluster unik".
+class SharedCommentStore:
+    def __init__(self, log, store):
+        self.log = log
+        self.store = store
+        self.duplicates = DuplicateIndex()
+        self.last_id = 0
+        self.generation = None
+        self._lock = threading.Lock()
+        self.sync()
+
+    def add(self, row):
+        # Store dan log memakai timestamp yang sama (dipakai agregat tren per jam/hari)
+        row = dict(row, created=row.get('created') or time.time())
+        with self._lock:
+            row['cluster'] = self.duplicates.add(row['Tweet'])
+            self.store.append(row)
+            self.log.append(row)
+
+    # Untuk ingestion: baris ditulis ke log dan di-flush dulu, baru masuk store. Kalau flush
+    # gagal belum ada yang masuk store, jadi batch bisa dicoba ulang tanpa baris ganda.
+    def add_many(self, rows):
+        now = time.time()
+        rows = [dict(row, created=row.get('created') or now) for row in rows]
+        with self._lock:
+            for row in rows:
+                row['cluster'] = self.duplicates.add(row['Tweet'])
+                self.log.append(row)
+            self.log.flush()
+            for row in rows:
+                self.store.append(row)
+
+    def sync(self):
+        with self._lock:
+            generation = self.log.generation()
+            rebuild = generation != self.generation
+            if rebuild:
+                # Log direset (seluruhnya atau per sesi): bangun ulang dari log, termasuk tulisan sendiri
+                self.log.flush()
+                self.store.clear()
+                self.duplicates = DuplicateIndex()
+                self.last_id = 0
+                self.generation = generation
+
+            for row in self.log.read_since(self.last_id, include_own=rebuild):
+                row['problems_clean'] = preprocess_problems(row['problem'])
+                if row['spans'] is None:
+                    # Baris log lama tanpa span: hitung sekali di sini, bukan saat render
+                    row['spans'] = keywords.detect_aspects(row['Tweet'], row['Sentiment'], with_spans=True)[1]
+                row['cluster'] = self.duplicates.add(row['Tweet'])
+                self.store.append(row)
+                self.last_id = row['id']
+        return self.store
+
+    # Reset "Data Baru" satu sesi: hanya baris yang ditambahkan sesi itu yang dihapus
+    def clear_session(self, session):
+        deleted = self.log.clear_session(session)
+        self.sync()
+        return deleted
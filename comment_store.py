@@ -0,0 +1,67 @@
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+
+
+# Penyimpanan komentar baru (append-only) dalam buffer kolom yang dialokasikan di depan.
+# Append O(1) amortized, cek "komentar baru?" lewat hash-set, dan index baris per kategori
+# supaya render cukup membaca potongan kecil tanpa concat/copy dataset dasar.
+class CommentStore:
+    COLUMNS = ('Kategori', 'Tweet', 'Sentiment', 'problem', 'problems_clean', 'created', 'cluster', 'spans')
+
+    def __init__(self, capacity=64):
+        self._capacity = capacity
+        self._columns = {column: np.empty(capacity, dtype=object) for column in self.COLUMNS}
+        self._size = 0
+        self.generation = 0  # Naik setiap clear(), supaya turunan (agregat) tahu harus dibangun ulang
+        self.tweets = set()
+        self.category_rows = defaultdict(list)   # kategori -> posisi semua baris
+        self.aspect_rows = defaultdict(list)     # kategori -> posisi baris yang punya aspek
+
+    def __len__(self):
+        return self._size
+
+    def _grow(self):
+        self._capacity *= 2
+        for column, values in self._columns.items():
+            grown = np.empty(self._capacity, dtype=object)
+            grown[:self._size] = values[:self._size]
+            self._columns[column] = grown
+
+    def append(self, row):
+        if self._size == self._capacity:
+            self._grow()
+
+        position = self._size
+        for column in self.COLUMNS:
+            self._columns[column][position] = row.get(column)
+        self._size += 1
+
+        self.tweets.add(row['Tweet'])
+        self.category_rows[row['Kategori']].append(position)
+        if row.get('problems_clean'):
+            self.aspect_rows[row['Kategori']].append(position)
+        return position
+
+    def is_new(self, tweet):
+        return tweet in self.tweets
+
+    def row(self, position):
+        return {column: self._columns[column][position] for column in self.COLUMNS}
+
+    def rows(self, start=0):
+        for position in range(start, self._size):
+            yield self.row(position)
+
+    # DataFrame kecil untuk posisi tertentu (urutan sesuai posisi yang diminta)
+    def frame(self, positions=None):
+        if positions is None:
+            positions = range(self._size)
+        positions = np.asarray(list(positions), dtype=np.int64)
+        return pd.DataFrame({column: self._columns[column][positions] for column in self.COLUMNS})
+
+    def clear(self):
+        generation = self.generation
+        self.__init__()
+        self.generation = generation + 1
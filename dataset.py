@@ -0,0 +1,259 @@
+import glob
+import hashlib
+import json
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+from dedup import DuplicateIndex
+from problems import explode_problems
+
+# Parquet butuh pyarrow; tanpa itu cache dilewati dan CSV dibaca langsung
+try:
+    import pyarrow  # noqa: F401
+    HAS_PARQUET = True
+except ImportError:
+    HAS_PARQUET = False
+
+CACHE_DIR = ".cache"
+CACHE_VERSION = 3  # Naikkan kalau format cache / pembersihan data berubah
+
+# Map ke hanya Positif/Negatif
+SENTIMENT_MAPPING = {
+    'Positive': 'Positif',
+    'Negative': 'Negatif',
+    'Positif': 'Positif',
+    'Negatif': 'Negatif'
+}
+
+# Pembersihan standar: Sentiment hanya Positif/Negatif, kolom kategori jadi category dtype
+def clean_frame(df):
+    # Pastikan kolom Sentiment hanya ada Positif dan Negatif
+    if 'Sentiment' in df.columns:
+        # Clean sentiment values
+        df['Sentiment'] = df['Sentiment'].str.strip().str.capitalize()
+        df['Sentiment'] = df['Sentiment'].map(SENTIMENT_MAPPING).fillna('Positif')  # Default ke Positif jika unknown
+        df['Sentiment'] = df['Sentiment'].astype('category')
+    if 'Kategori' in df.columns:
+        df['Kategori'] = df['Kategori'].astype('category')
+    return df
+
+
+# Kolom 'cluster' (int64): key cluster duplikat/near-duplicate tiap tweet (dedup.py).
+# Retweet dan repost dengan wakil yang sama punya key yang sama, juga antar file.
+def add_clusters(df):
+    df['cluster'] = DuplicateIndex().cluster_keys(df['Tweet'].fillna('').astype(str).tolist())
+    return df
+
+
+# Kolom waktu tweet yang dikenali (urutan prioritas); kalau tidak ada, waktu ingestion dipakai
+TIMESTAMP_COLUMNS = ('created_at', 'created', 'Tanggal', 'date')
+
+# Kolom 'created' (epoch detik, float) untuk agregat tren per jam/hari
+def add_timestamps(df, ingested_at):
+    created = pd.Series(float(ingested_at), index=df.index)
+    for column in TIMESTAMP_COLUMNS:
+        if column in df.columns:
+            values = df[column]
+            if pd.api.types.is_numeric_dtype(values):
+                seconds = values.astype('float64')
+            else:
+                parsed = pd.to_datetime(values, errors='coerce', utc=True, format='mixed')
+                seconds = (parsed - pd.Timestamp(0, tz='UTC')).dt.total_seconds()
+            created = seconds.fillna(float(ingested_at))
+            break
+    df['created'] = created.astype('float64')
+    return df
+
+
+def file_hash(path, block_size=1 << 20):
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _read_meta(meta_path):
+    try:
+        with open(meta_path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_meta(meta_path, meta):
+    tmp_path = meta_path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(meta, f)
+    os.replace(tmp_path, meta_path)
+
+
+# Sumber data: satu file, direktori shard (*.csv), glob, atau beberapa dipisah koma.
+# Shard scrape baru cukup ditaruh di direktori tanpa menulis ulang CSV besar.
+def resolve_sources(spec):
+    paths = []
+    for part in str(spec).split(','):
+        part = part.strip()
+        if not part:
+            continue
+        if os.path.isdir(part):
+            paths.extend(sorted(glob.glob(os.path.join(part, '*.csv'))))
+        elif glob.has_magic(part):
+            paths.extend(sorted(glob.glob(part)))
+        elif os.path.exists(part):
+            paths.append(part)
+    return list(dict.fromkeys(paths))
+
+
+# (path, mtime, size) semua sumber - berubah kalau shard ditambah, dihapus, atau diedit
+def sources_signature(paths):
+    signature = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        signature.append((path, stat.st_mtime, stat.st_size))
+    return tuple(signature)
+
+
+def _partition_key(category):
+    return re.sub(r'[^\w-]', '_', str(category))
+
+
+def _partition_dir(csv_path, cache_dir):
+    stem = os.path.splitext(os.path.basename(csv_path))[0]
+    digest = hashlib.sha1(os.path.abspath(csv_path).encode('utf-8')).hexdigest()[:8]
+    return os.path.join(cache_dir, 'partitions', f'{stem}-{digest}')
+
+
+# Pecah satu file sumber per Kategori ke Parquet (sekali per versi file):
+# <cache>/partitions/<nama>-<hash>/<kategori>.parquet + .aspects.parquet + meta.json.
+# meta['categories'] / meta['aspect_rows'] = {kategori: jumlah baris}; row_id tabel aspek lokal per partisi.
+def partition_source(csv_path, cache_dir=CACHE_DIR):
+    directory = _partition_dir(csv_path, cache_dir)
+    meta_path = os.path.join(directory, 'meta.json')
+    stat = os.stat(csv_path)
+    meta = _read_meta(meta_path)
+
+    if meta and meta.get('version') == CACHE_VERSION:
+        if meta.get('mtime') == stat.st_mtime and meta.get('size') == stat.st_size:
+            return meta
+        if meta.get('sha1') == file_hash(csv_path):
+            meta.update(mtime=stat.st_mtime, size=stat.st_size)
+            _write_meta(meta_path, meta)
+            return meta
+
+    df = add_clusters(add_timestamps(clean_frame(pd.read_csv(csv_path)), stat.st_mtime))
+    os.makedirs(directory, exist_ok=True)
+    categories, aspect_rows = {}, {}
+    for category, part in df.groupby('Kategori', sort=False, observed=True):
+        part = part.reset_index(drop=True)
+        aspects = explode_problems(part['problem'])
+        key = _partition_key(category)
+        part.to_parquet(os.path.join(directory, key + '.parquet'), index=False)
+        aspects.to_parquet(os.path.join(directory, key + '.aspects.parquet'), index=False)
+        categories[str(category)] = len(part)
+        aspect_rows[str(category)] = len(aspects)
+
+    meta = {
+        'version': CACHE_VERSION,
+        'mtime': stat.st_mtime,
+        'size': stat.st_size,
+        'sha1': file_hash(csv_path),
+        'categories': categories,
+        'aspect_rows': aspect_rows,
+    }
+    _write_meta(meta_path, meta)
+    return meta
+
+
+# Jumlah baris per kategori di semua sumber (dari meta, tanpa membaca data)
+def partition_counts(paths, cache_dir=CACHE_DIR):
+    counts = {}
+    for path in paths:
+        if HAS_PARQUET:
+            categories = partition_source(path, cache_dir)['categories']
+        else:
+            categories = clean_frame(pd.read_csv(path, usecols=['Kategori']))['Kategori'].value_counts().to_dict()
+        for category, n in categories.items():
+            counts[category] = counts.get(category, 0) + int(n)
+    return counts
+
+
+# Load satu kategori dari semua sumber: hanya Parquet partisi itu yang dibaca,
+# jadi memori dan waktu load sebanding dengan partisi yang dilihat, bukan seluruh korpus.
+# Hasil: (df, tabel aspek dengan row_id lokal partisi).
+def load_partition(paths, category, cache_dir=CACHE_DIR):
+    if not HAS_PARQUET:
+        # Tanpa pyarrow: baca CSV penuh lalu filter (tidak ada penghematan)
+        frames = [add_clusters(add_timestamps(clean_frame(pd.read_csv(path)), os.path.getmtime(path))) for path in paths]
+        df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=['Kategori', 'Tweet', 'Sentiment', 'problem', 'created', 'cluster'])
+        df = df[df['Kategori'] == category].reset_index(drop=True)
+        return df, explode_problems(df['problem'])
+
+    import pyarrow.parquet as pq
+
+    key = _partition_key(category)
+    frame_files, aspect_files, offsets, aspect_counts = [], [], [], []
+    rows = 0
+    for path in paths:
+        meta = partition_source(path, cache_dir)
+        n = meta['categories'].get(str(category))
+        if not n:
+            continue
+        directory = _partition_dir(path, cache_dir)
+        frame_files.append(os.path.join(directory, key + '.parquet'))
+        aspect_files.append(os.path.join(directory, key + '.aspects.parquet'))
+        offsets.append(rows)
+        aspect_counts.append(meta['aspect_rows'][str(category)])
+        rows += n
+
+    if not frame_files:
+        df = pd.DataFrame({'Kategori': pd.Categorical([]), 'Tweet': pd.Series([], dtype=object),
+                           'Sentiment': pd.Categorical([]), 'problem': pd.Series([], dtype=object),
+                           'created': pd.Series([], dtype='float64'), 'cluster': pd.Series([], dtype='int64')})
+        return df, explode_problems(pd.Series([], dtype=object))
+
+    # Semua shard dibaca dalam satu panggilan per jenis file (urutan file dipertahankan)
+    df = pq.ParquetDataset(frame_files).read().to_pandas()
+    aspect_table = pq.ParquetDataset(aspect_files).read().to_pandas()
+    # row_id tiap shard digeser sebanyak baris shard sebelumnya (jumlah dari meta)
+    aspect_table['row_id'] += np.repeat(np.asarray(offsets, dtype=np.int64), aspect_counts)
+
+    # Shard berbeda bisa punya set kategori berbeda -> hasil concat jadi object
+    for frame, columns in ((df, ('Kategori', 'Sentiment')), (aspect_table, ('aspect',))):
+        for column in columns:
+            if not isinstance(frame[column].dtype, pd.CategoricalDtype):
+                frame[column] = frame[column].astype('category')
+    return df, aspect_table
+
+
+# Seluruh korpus (semua kategori) dari satu/beberapa sumber, lewat cache partisi yang sama
+# dengan dashboard: partisi tiap kategori dibaca lalu digabung (baris dikelompokkan per Kategori,
+# row_id tabel aspek digeser ke posisi global). Dipakai CLI dan benchmark.
+def load_dataset(paths, cache_dir=CACHE_DIR):
+    if isinstance(paths, str):
+        paths = [paths]
+    if not HAS_PARQUET:
+        frames = [add_clusters(add_timestamps(clean_frame(pd.read_csv(path)), os.path.getmtime(path))) for path in paths]
+        df = pd.concat(frames, ignore_index=True)
+        return df, explode_problems(df['problem'])
+
+    frames, aspect_tables = [], []
+    rows = 0
+    for category in partition_counts(paths, cache_dir):
+        df, aspect_table = load_partition(paths, category, cache_dir)
+        aspect_table['row_id'] += rows
+        rows += len(df)
+        frames.append(df)
+        aspect_tables.append(aspect_table)
+    df = pd.concat(frames, ignore_index=True)
+    aspect_table = pd.concat(aspect_tables, ignore_index=True)
+    for frame, columns in ((df, ('Kategori', 'Sentiment')), (aspect_table, ('aspect',))):
+        for column in columns:
+            frame[column] = frame[column].astype(str).astype('category')
+    return df, aspect_table
@@ -0,0 +1,140 @@
+import hashlib
+import re
+import zlib
+
+import numpy as np
+import pandas as pd
+
+# Normalisasi untuk deteksi duplikat: retweet ("RT @akun:"), URL t.co, mention,
+# tanda baca dan huruf besar tidak membedakan dua tweet
+RETWEET_PATTERN = re.compile(r"^\s*rt\s+@\w+:?\s*")
+URL_PATTERN = re.compile(r"(?:https?://|www\.)\S+")
+MENTION_PATTERN = re.compile(r"@\w+")
+NON_WORD_PATTERN = re.compile(r"[^a-z0-9]+")
+
+# Bilangan prima Mersenne 2^31 - 1: hash shingle dan parameter permutasi < 2^31,
+# jadi a * x + b muat di uint64 tanpa overflow
+MERSENNE_PRIME = (1 << 31) - 1
+
+
+def normalize_for_dedup(text):
+    text = str(text).lower()
+    text = RETWEET_PATTERN.sub(" ", text)
+    text = URL_PATTERN.sub(" ", text)
+    text = MENTION_PATTERN.sub(" ", text)
+    return NON_WORD_PATTERN.sub(" ", text).strip()
+
+
+# Key 64-bit (signed, muat di kolom int64) dari teks ternormalisasi
+def text_key(normalized):
+    digest = hashlib.blake2b(normalized.encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'little', signed=True)
+
+
+# Shingle = n-gram kata; teks lebih pendek dari n kata jadi satu shingle utuh
+def shingles(normalized, size=3):
+    tokens = normalized.split()
+    if len(tokens) <= size:
+        return {' '.join(tokens)}
+    return {' '.join(tokens[i:i + size]) for i in range(len(tokens) - size + 1)}
+
+
+# Index duplikat incremental: hash teks ternormalisasi untuk duplikat persis, lalu
+# MinHash + LSH (banding) untuk near-duplicate (retweet dengan komentar, repost bot).
+# Setiap cluster diwakili tweet pertamanya; tweet baru dibandingkan dengan signature
+# wakil cluster (bukan anggota lain), jadi cluster tidak "merambat" lewat rantai kemiripan.
+# Key cluster = key teks wakilnya, jadi sama di semua proses/shard untuk wakil yang sama.
+class DuplicateIndex:
+    def __init__(self, num_perm=64, bands=16, threshold=0.7, shingle_size=3, seed=1):
+        if num_perm % bands:
+            raise ValueError("num_perm harus habis dibagi bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows_per_band = num_perm // bands
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, MERSENNE_PRIME, size=num_perm).astype(np.uint64)[:, None]
+        self._b = rng.randint(0, MERSENNE_PRIME, size=num_perm).astype(np.uint64)[:, None]
+
+        self.exact = {}                                 # key teks -> key cluster
+        self.signatures = {}                            # key cluster -> signature MinHash wakil
+        self.buckets = [{} for _ in range(bands)]       # per band: bytes band -> [key cluster]
+        self.near_duplicates = 0
+
+    def __len__(self):
+        return len(self.signatures)
+
+    def signature(self, normalized):
+        hashes = np.fromiter(
+            (zlib.crc32(shingle.encode('utf-8')) % MERSENNE_PRIME for shingle in shingles(normalized, self.shingle_size)),
+            dtype=np.uint64,
+        )
+        return ((self._a * hashes + self._b) % MERSENNE_PRIME).min(axis=1).astype(np.uint32)
+
+    def _band_keys(self, signature):
+        rows = self.rows_per_band
+        return [signature[i * rows:(i + 1) * rows].tobytes() for i in range(self.bands)]
+
+    # Key cluster untuk satu teks (teks baru yang tidak mirip apa pun membuka cluster baru)
+    def add(self, text):
+        normalized = normalize_for_dedup(text)
+        key = text_key(normalized)
+        cluster = self.exact.get(key)
+        if cluster is not None:
+            return cluster
+
+        signature = self.signature(normalized)
+        band_keys = self._band_keys(signature)
+        candidates = dict.fromkeys(
+            candidate for band, band_key in zip(self.buckets, band_keys) for candidate in band.get(band_key, ())
+        )
+        for candidate in candidates:
+            # Estimasi Jaccard = porsi nilai signature yang sama
+            if np.count_nonzero(self.signatures[candidate] == signature) >= self.threshold * self.num_perm:
+                self.exact[key] = candidate
+                self.near_duplicates += 1
+                return candidate
+
+        self.exact[key] = key
+        self.signatures[key] = signature
+        for band, band_key in zip(self.buckets, band_keys):
+            band.setdefault(band_key, []).append(key)
+        return key
+
+    def cluster_keys(self, texts):
+        return np.fromiter((self.add(text) for text in texts), dtype=np.int64, count=len(texts))
+
+    def stats(self):
+        return {'texts': len(self.exact), 'clusters': len(self.signatures), 'near_duplicates': self.near_duplicates}
+
+
+# Posisi wakil tiap cluster (urut kemunculan pertama) dan, per teks, indeks wakilnya
+def collapse(texts, index=None):
+    index = index or DuplicateIndex()
+    codes, _ = pd.factorize(index.cluster_keys(texts))
+    representatives = np.unique(codes, return_index=True)[1]
+    return representatives, codes
+
+
+# Label hanya wakil cluster dengan label_batch(list_teks) -> list_label,
+# lalu sebarkan labelnya ke semua anggota (urutan hasil = urutan texts)
+def fan_out(texts, label_batch, index=None):
+    texts = list(texts)
+    if not texts:
+        return []
+    representatives, codes = collapse(texts, index)
+    labels = label_batch([texts[i] for i in representatives])
+    return [labels[code] for code in codes]
+
+
+# Baris pertama tiap cluster (per kategori) + tabel aspeknya dengan row_id dipetakan ulang,
+# untuk agregat "cluster unik" di dashboard
+def representative_rows(df, aspect_table):
+    keep = ~df.duplicated(['Kategori', 'cluster']).to_numpy()
+    positions = np.cumsum(keep) - 1
+    aspect_keep = keep[aspect_table['row_id'].to_numpy()]
+    aspects = aspect_table[aspect_keep].reset_index(drop=True)
+    aspects['row_id'] = positions[aspects['row_id'].to_numpy()]
+    return df[keep].reset_index(drop=True), aspects
@@ -0,0 +1,86 @@
+import html
+
+import numpy as np
+
+PAGE_SIZE = 8
+
+
+# Teks tweet dengan keyword pemicu aspek di-highlight. spans = (aspek, keyword, start, end)
+# yang disimpan saat baris dilabel (analisis, ingestion, re-tag) - render tidak men-scan ulang.
+# Hanya span untuk aspek yang tercatat di baris ini; span yang tumpang tindih digabung.
+def highlight_tweet(text, aspects, spans):
+    text = str(text)
+    parts = []
+    position = 0
+    for aspect, keyword, start, end in spans or ():
+        if aspect not in aspects or start < position:
+            continue
+        parts.append(html.escape(text[position:start]))
+        parts.append(
+            f'<mark class="keyword-hit" title="{html.escape(aspect)}: {html.escape(keyword)}">'
+            f'{html.escape(text[start:end])}</mark>'
+        )
+        position = end
+    parts.append(html.escape(text[position:]))
+    return ''.join(parts)
+
+
+# HTML satu kartu tweet (tanpa baris kosong/indentasi, supaya aman digabung dalam satu st.markdown)
+def tweet_card_html(tweet, is_new=False):
+    # Tentukan jenis tag berdasarkan sentimen
+    tag_class = "problem-tag" if tweet['Sentiment'] == 'Negatif' else "good-tag"
+    aspects = [aspect for aspect in (tweet['problems_clean'] or []) if aspect and str(aspect).strip()]
+    aspects_html = ''.join(f'<span class="{tag_class}">{html.escape(str(aspect))}</span>' for aspect in aspects)
+
+    # Highlight komentar baru
+    border_color = "#ff6b6b" if is_new else "var(--primary-color)"
+    return (
+        f'<div class="tweet-card" style="border-left-color: {border_color};">'
+        f'<p class="tweet-text">{highlight_tweet(tweet["Tweet"], aspects, tweet.get("spans"))}</p>'
+        f'<div class="tweet-footer"><div class="problems-container">{aspects_html}</div></div>'
+        '</div>'
+    )
+
+
+# Satu payload HTML untuk satu halaman feed
+def feed_html(tweets, is_new):
+    return ''.join(tweet_card_html(tweet, is_new(tweet['Tweet'])) for tweet in tweets)
+
+
+# Filter posisi baris dataset dasar (vectorized); hasil terbaru di depan
+def filter_base_positions(df, aspect_table, positions, sentiment=None, aspect=None, query=None):
+    positions = np.asarray(positions, dtype=np.int64)
+    mask = np.ones(len(positions), dtype=bool)
+    if sentiment:
+        mask &= df['Sentiment'].to_numpy()[positions] == sentiment
+    if aspect:
+        row_ids = aspect_table['row_id'].to_numpy()[(aspect_table['aspect'] == aspect).to_numpy()]
+        mask &= np.isin(positions, row_ids)
+    if query:
+        tweets = df['Tweet'].iloc[positions[mask]].astype(str)
+        mask[mask] = tweets.str.contains(query, case=False, regex=False).to_numpy()
+    return positions[mask][::-1]
+
+
+# Filter posisi komentar baru di CommentStore (jumlahnya kecil, cukup loop biasa); terbaru di depan
+def filter_store_positions(store, positions, sentiment=None, aspect=None, query=None):
+    query = query.lower() if query else None
+    matches = []
+    for position in reversed(positions):
+        row = store.row(position)
+        if sentiment and row['Sentiment'] != sentiment:
+            continue
+        if aspect and aspect not in (row['problems_clean'] or []):
+            continue
+        if query and query not in str(row['Tweet']).lower():
+            continue
+        matches.append(position)
+    return matches
+
+
+# Jumlah halaman (minimal 1) dan potongan [start, end) untuk halaman ke-page (mulai 1)
+def page_bounds(total, page, page_size=PAGE_SIZE):
+    pages = max(1, -(-total // page_size))
+    page = min(max(1, page), pages)
+    start = (page - 1) * page_size
+    return pages, start, min(start + page_size, total)
@@ -0,0 +1,121 @@
+import queue
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import Future
+
+import numpy as np
+
+from sentiment import analyze_sentiment, analyze_sentiment_batch
+
+
+# Server inference micro-batching in-process, dipakai bersama semua sesi Streamlit.
+# Setiap sesi mengirim teks ke satu queue dan menerima Future; satu thread worker
+# mengambil request pertama, menunggu paling lama batch_window detik (atau sampai
+# max_batch_size) untuk request lain, lalu menjalankan satu forward pass ber-padding.
+# Hanya thread ini yang memanggil model, jadi thread intra-op torch tidak diperebutkan
+# oleh banyak sesi sekaligus.
+class BatchingInferenceServer:
+    def __init__(self, get_model, max_batch_size=16, batch_window=0.005, max_length=128, latency_samples=2000):
+        self.get_model = get_model          # fungsi() -> (tokenizer, model); (None, None) = lexicon
+        self.max_batch_size = max_batch_size
+        self.batch_window = batch_window
+        self.max_length = max_length
+
+        self.queue = queue.Queue()
+        self.requests = 0
+        self.batches = 0
+        self.errors = 0
+        self.batch_sizes = Counter()         # ukuran batch -> jumlah batch
+        self.queue_depths = Counter()        # panjang antrian saat batch diambil -> jumlah batch
+        self.latencies = deque(maxlen=latency_samples)  # detik dari submit sampai hasil siap
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="inference-server", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout=5):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    # Future berisi (sentiment, confidence)
+    def submit(self, text):
+        future = Future()
+        self.queue.put((str(text), future, time.perf_counter()))
+        return future
+
+    # Versi blocking untuk satu teks. Fallback lexicon murah, jadi langsung dihitung tanpa antri.
+    def analyze(self, text, timeout=None):
+        tokenizer, model = self.get_model()
+        if tokenizer is None or model is None:
+            return analyze_sentiment(str(text), None, None)
+        return self.submit(text).result(timeout)
+
+    def _next_batch(self):
+        try:
+            batch = [self.queue.get(timeout=0.5)]
+        except queue.Empty:
+            return []
+        depth = self.queue.qsize() + 1
+        deadline = time.perf_counter() + self.batch_window
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self.queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        with self._lock:
+            self.queue_depths[depth] += 1
+        return batch
+
+    def _run(self):
+        while not self._stop.is_set():
+            batch = self._next_batch()
+            # Request yang sudah dibatalkan pemanggilnya dilewati
+            batch = [item for item in batch if item[1].set_running_or_notify_cancel()]
+            if not batch:
+                continue
+
+            try:
+                tokenizer, model = self.get_model()
+                results = analyze_sentiment_batch([text for text, _, _ in batch], tokenizer, model,
+                                                  batch_size=len(batch), max_length=self.max_length)
+            except Exception as e:
+                with self._lock:
+                    self.errors += 1
+                for _, future, _ in batch:
+                    future.set_exception(e)
+                continue
+
+            done = time.perf_counter()
+            for (_, future, enqueued), result in zip(batch, results):
+                future.set_result(result)
+            with self._lock:
+                self.requests += len(batch)
+                self.batches += 1
+                self.batch_sizes[len(batch)] += 1
+                self.latencies.extend(done - enqueued for _, _, enqueued in batch)
+
+    def stats(self):
+        with self._lock:
+            latencies = np.array(self.latencies) * 1000
+            stats = {
+                'queue_depth': self.queue.qsize(),
+                'requests': self.requests,
+                'batches': self.batches,
+                'errors': self.errors,
+                'mean_batch_size': self.requests / self.batches if self.batches else 0.0,
+                'batch_sizes': dict(sorted(self.batch_sizes.items())),
+                'queue_depths': dict(sorted(self.queue_depths.items())),
+            }
+        for q in (50, 95, 99):
+            stats[f'latency_p{q}_ms'] = float(np.percentile(latencies, q)) if len(latencies) else 0.0
+        return stats
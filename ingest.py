@@ -0,0 +1,345 @@
+"""Ingestion streaming: tail file/direktori JSONL hasil scraper dan label baris baru.
+
+Setiap baris JSONL minimal berisi {"Tweet": "...", "Kategori": "krl"}; baris lain dihitung malformed.
+Waktu tweet diambil dari "created_at"/"created" kalau ada, selain itu waktu ingestion.
+Baris baru dibaca oleh thread reader ke queue terbatas (backpressure: kalau queue
+penuh, reader berhenti membaca dan data menunggu di file), lalu thread labeller
+mengambil micro-batch, melabel dengan analyze_sentiment_batch + keyword, dan
+mengirim hasilnya ke sink (store dashboard / CommentLog). Retweet/duplikat dalam satu
+micro-batch hanya dilabel sekali (dedup.fan_out).
+Offset file (posisi yang benar-benar dicapai + inode file) disimpan setelah sink menyimpan
+batch ke disk, jadi restart tidak membaca ulang histori dan tidak melewatkan baris; file yang
+di-truncate atau dirotasi (inode baru) dibaca dari awal. Batch yang gagal dicoba ulang dengan
+backoff; setelah max_retries percobaan batch dipindah ke file dead-letter supaya feed jalan lagi.
+
+Mode headless (dashboard lain membaca hasilnya lewat log SQLite bersama):
+    python ingest.py scraper_output/ --log .cache/comments.sqlite
+"""
+import argparse
+import datetime
+import fcntl
+import glob
+import json
+import os
+import queue
+import sys
+import threading
+import time
+
+import keywords
+from dedup import fan_out
+from sentiment import analyze_sentiment_batch
+
+OFFSETS_PATH = os.path.join(".cache", "ingest_offsets.json")
+DEAD_LETTER_PATH = os.path.join(".cache", "ingest_deadletter.jsonl")
+
+
+# Waktu tweet dari record: epoch detik, ISO 8601, atau format created_at Twitter.
+# Tanpa waktu (atau tidak bisa dibaca) -> waktu ingestion.
+def parse_created(value, default=None):
+    default = time.time() if default is None else default
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    if isinstance(value, str) and value.strip():
+        value = value.strip()
+        try:
+            return datetime.datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+        except ValueError:
+            pass
+        try:
+            return datetime.datetime.strptime(value, '%a %b %d %H:%M:%S %z %Y').timestamp()
+        except ValueError:
+            pass
+    return default
+
+
+# Posisi baca satu file: {"offset": byte, "inode": inode file saat dibaca}.
+# File offset versi lama menyimpan angka saja (inode tidak diketahui).
+def file_position(value):
+    if isinstance(value, dict):
+        return value.get('offset', 0), value.get('inode')
+    return int(value or 0), None
+
+
+# Baca baris JSONL baru dari satu file atau semua *.jsonl dalam direktori
+class JsonlTailer:
+    def __init__(self, path, offsets=None):
+        self.path = path
+        self.offsets = dict(offsets or {})  # file -> {"offset", "inode"} yang sudah dibaca
+
+    def files(self):
+        if os.path.isdir(self.path):
+            return sorted(glob.glob(os.path.join(self.path, "*.jsonl")))
+        return [self.path] if os.path.exists(self.path) else []
+
+    # Yield (file, posisi setelah baris, record); baris terakhir yang belum lengkap ditunda
+    def poll(self):
+        for file_path in self.files():
+            offset, inode = file_position(self.offsets.get(file_path))
+            with open(file_path, "rb") as f:
+                stat = os.fstat(f.fileno())
+                if (inode is not None and inode != stat.st_ino) or stat.st_size < offset:
+                    offset = 0  # File dirotasi (inode baru) / di-truncate: baca dari awal
+                f.seek(offset)
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break
+                    offset += len(line)
+                    position = {'offset': offset, 'inode': stat.st_ino}
+                    self.offsets[file_path] = position
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        record = None
+                    yield file_path, position, record
+
+
+class StreamIngestor:
+    def __init__(self, path, sink, get_model, batch_size=32, max_queue=1000,
+                 poll_interval=1.0, batch_window=0.2, retry_interval=5.0, max_retry_interval=60.0,
+                 max_retries=5, offsets_path=OFFSETS_PATH, dead_letter_path=DEAD_LETTER_PATH):
+        self.sink = sink                  # fungsi(list_of_rows); baris harus sudah di disk saat return
+        self.get_model = get_model        # fungsi() -> (tokenizer, model); (None, None) = lexicon
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.batch_window = batch_window
+        self.retry_interval = retry_interval
+        self.max_retry_interval = max_retry_interval
+        self.max_retries = max_retries
+        self.offsets_path = offsets_path
+        self.dead_letter_path = dead_letter_path
+
+        self.committed = self._load_offsets()
+        self.tailer = JsonlTailer(path, self.committed)
+        self.queue = queue.Queue(maxsize=max_queue)
+
+        self.ingested = 0
+        self.malformed = 0
+        self.batches = 0
+        self.last_batch_seconds = 0.0
+        self.errors = 0
+        self.last_error = None
+        self.dead_lettered = 0
+        self.retries = 0            # percobaan gagal untuk batch yang sedang macet
+        self.stalled_since = None   # waktu batch yang sedang macet pertama gagal
+        self._stop = threading.Event()
+        self._threads = []
+
+    def _load_offsets(self):
+        try:
+            with open(self.offsets_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_offsets(self):
+        os.makedirs(os.path.dirname(self.offsets_path) or ".", exist_ok=True)
+        tmp_path = self.offsets_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.committed, f)
+        os.replace(tmp_path, self.offsets_path)
+
+    def start(self):
+        for target, name in ((self._read_loop, "ingest-reader"), (self._label_loop, "ingest-labeller")):
+            thread = threading.Thread(target=target, name=name, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def stop(self, timeout=5):
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def _read_loop(self):
+        while not self._stop.is_set():
+            for item in self.tailer.poll():
+                # put() blocking = backpressure; cek stop berkala supaya bisa berhenti
+                while not self._stop.is_set():
+                    try:
+                        self.queue.put(item, timeout=0.5)
+                        break
+                    except queue.Full:
+                        continue
+                if self._stop.is_set():
+                    return
+            self._stop.wait(self.poll_interval)
+
+    def _next_batch(self):
+        try:
+            batch = [self.queue.get(timeout=self.poll_interval)]
+        except queue.Empty:
+            return []
+        deadline = time.monotonic() + self.batch_window
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self.queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _label_loop(self):
+        batch = []
+        while not self._stop.is_set():
+            batch = batch or self._next_batch()
+            if not batch:
+                continue
+            try:
+                self.process(batch)
+            except Exception as e:
+                # Batch yang sama dicoba ulang dengan backoff (baris berikutnya menunggu di queue),
+                # jadi offset yang di-commit tidak pernah melewati batch yang gagal
+                self.errors += 1
+                self.last_error = repr(e)
+                self.retries += 1
+                self.stalled_since = self.stalled_since or time.time()
+                if self.retries <= self.max_retries:
+                    self._stop.wait(min(self.retry_interval * 2 ** (self.retries - 1), self.max_retry_interval))
+                    continue
+                try:
+                    self._dead_letter(batch, repr(e))
+                except Exception as e:
+                    # Dead-letter juga gagal (disk?): tetap macet, dicoba lagi nanti
+                    self.last_error = repr(e)
+                    self._stop.wait(self.max_retry_interval)
+                    continue
+            batch = []
+            self.retries = 0
+            self.stalled_since = None
+
+    # Batch yang terus gagal disimpan apa adanya (record + error) lalu offset-nya di-commit
+    def _dead_letter(self, batch, error):
+        os.makedirs(os.path.dirname(self.dead_letter_path) or ".", exist_ok=True)
+        with open(self.dead_letter_path, "a") as f:
+            for file_path, position, record in batch:
+                f.write(json.dumps({'file': file_path, 'offset': position['offset'], 'error': error,
+                                    'record': record}, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self._commit(batch)
+        self.dead_lettered += len(batch)
+
+    # Posisi yang dicapai batch (item urut sesuai pembacaan, jadi yang terakhir per file yang
+    # berlaku - termasuk saat posisi kembali ke awal karena file dirotasi)
+    def _commit(self, batch):
+        for file_path, position, _ in batch:
+            self.committed[file_path] = position
+        self._save_offsets()
+
+    def process(self, batch):
+        start = time.perf_counter()
+        records = [
+            record for _, _, record in batch
+            if isinstance(record, dict) and record.get('Kategori') and str(record.get('Tweet') or '').strip()
+        ]
+
+        if records:
+            tokenizer, model = self.get_model()
+            keyword_set = keywords.active_keywords()
+            texts = [str(record['Tweet']) for record in records]
+
+            def label(batch):
+                results = analyze_sentiment_batch(batch, tokenizer, model, batch_size=self.batch_size)
+                return [
+                    (text, sentiment) + tuple(keyword_set.detect_aspects(text, sentiment, with_spans=True))
+                    for text, (sentiment, _) in zip(batch, results)
+                ]
+
+            rows = []
+            for record, text, (labelled, sentiment, aspects, spans) in zip(records, texts, fan_out(texts, label)):
+                if text != labelled:
+                    # Anggota cluster ikut label wakilnya, tapi posisi span milik teksnya sendiri
+                    spans = keyword_set.detect_aspects(text, sentiment, with_spans=True)[1]
+                rows.append({
+                    'Kategori': record['Kategori'],
+                    'Tweet': text,
+                    'Sentiment': sentiment,
+                    'problem': str(aspects),
+                    'problems_clean': list(aspects),
+                    'spans': spans,
+                    'created': parse_created(record.get('created_at', record.get('created'))),
+                })
+            self.sink(rows)
+            self.ingested += len(rows)
+
+        # Offset baru dianggap selesai setelah sink menyimpan batch
+        self._commit(batch)
+        self.malformed += len(batch) - len(records)
+        self.batches += 1
+        self.last_batch_seconds = time.perf_counter() - start
+
+    def stats(self):
+        return {
+            'queue_depth': self.queue.qsize(),
+            'queue_max': self.queue.maxsize,
+            'ingested': self.ingested,
+            'malformed': self.malformed,
+            'batches': self.batches,
+            'last_batch_seconds': self.last_batch_seconds,
+            'errors': self.errors,
+            'retries': self.retries,
+            'stalled_seconds': time.time() - self.stalled_since if self.stalled_since else 0.0,
+            'dead_lettered': self.dead_lettered,
+        }
+
+
+# Pastikan hanya satu ingestor per node (beberapa proses Streamlit bisa mencoba start)
+def acquire_ingest_lock(offsets_path=OFFSETS_PATH):
+    os.makedirs(os.path.dirname(offsets_path) or ".", exist_ok=True)
+    lock_file = open(offsets_path + ".lock", "w")
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock_file.close()
+        return None
+    return lock_file
+
+
+def main(argv=None):
+    from comment_log import CommentLog
+    from sentiment import MODEL_NAME, load_model
+
+    parser = argparse.ArgumentParser(description="Tail JSONL tweet dan label ke log komentar bersama.")
+    parser.add_argument('path', help="File JSONL atau direktori berisi *.jsonl")
+    parser.add_argument('--log', default=os.path.join(".cache", "comments.sqlite"))
+    parser.add_argument('--model', default=MODEL_NAME)
+    parser.add_argument('--batch-size', type=int, default=32)
+    parser.add_argument('--max-queue', type=int, default=1000)
+    parser.add_argument('--no-model', action='store_true')
+    args = parser.parse_args(argv)
+
+    if acquire_ingest_lock() is None:
+        print("Ingestor lain sudah berjalan di node ini.", file=sys.stderr)
+        return 1
+
+    tokenizer, model = None, None
+    if not args.no_model:
+        try:
+            tokenizer, model = load_model(args.model)
+        except Exception as e:
+            print(f"Error loading model: {e}. Menggunakan fallback lexicon...", file=sys.stderr)
+
+    log = CommentLog(args.log)
+
+    def sink(rows):
+        for row in rows:
+            log.append(row)
+        log.flush()  # Offset baru disimpan setelah ini, jadi pastikan baris sudah di disk
+
+    ingestor = StreamIngestor(args.path, sink, lambda: (tokenizer, model),
+                              batch_size=args.batch_size, max_queue=args.max_queue).start()
+    try:
+        while True:
+            time.sleep(5)
+            print(ingestor.stats(), file=sys.stderr)
+    except KeyboardInterrupt:
+        ingestor.stop()
+        log.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
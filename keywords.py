@@ -0,0 +1,381 @@
+import functools
+import hashlib
+import json
+import os
+import re
+import threading
+from collections import Counter, namedtuple
+
+# Dictionary keyword disimpan sebagai file data (bukan literal Python), supaya bisa diedit
+# dan di-reload tanpa restart app / reload model:
+#   data/good_keywords.json     aspek positif/netral
+#   data/problem_keywords.json  masalah (sentimen negatif)
+# Format: {"version": n, "aspects": {aspek: [keyword, ...]}, "forms": {keyword: [bentuk, ...]}};
+# "version" dinaikkan manual saat edit. "forms" (opsional) = daftar eksplisit bentuk berimbuhan
+# yang dihitung sebagai keyword itu ('macet': ['kemacetan', 'macetnya']); tidak ada stemming otomatis.
+# KEYWORDS_DIR untuk memakai direktori lain.
+KEYWORDS_DIR = os.environ.get("KEYWORDS_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data"))
+KEYWORD_FILES = {'good': 'good_keywords.json', 'problem': 'problem_keywords.json'}
+
+def keyword_paths(directory=KEYWORDS_DIR):
+    return {name: os.path.join(directory, filename) for name, filename in KEYWORD_FILES.items()}
+
+def _is_string_lists(mapping):
+    return isinstance(mapping, dict) and all(
+        isinstance(values, list) and all(isinstance(value, str) for value in values)
+        for values in mapping.values()
+    )
+
+# Baca satu file dictionary -> (versi file, {aspek: [keyword, ...]}, {keyword: [bentuk, ...]});
+# format salah -> ValueError
+def load_keyword_file(path):
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+    aspects = data.get('aspects') if isinstance(data, dict) else None
+    forms = data.get('forms', {}) if isinstance(data, dict) else None
+    if not _is_string_lists(aspects) or not _is_string_lists(forms):
+        raise ValueError(f'{path}: format harus {{"version": n, "aspects": {{aspek: [keyword, ...]}}, '
+                         f'"forms": {{keyword: [bentuk, ...]}}}}')
+    return data.get('version'), aspects, forms
+
+# Satu keyword yang cocok: aspek, keyword di dictionary, dan posisi karakter [start, end)
+# di teks asli (dipakai untuk highlight dan debugging tag yang salah)
+MatchSpan = namedtuple('MatchSpan', ['aspect', 'keyword', 'start', 'end'])
+
+# lower() bisa mengubah panjang string untuk beberapa karakter unicode ('İ');
+# versi ini menjaga panjang supaya posisi span tetap sesuai teks asli
+def lower_text(text):
+    lowered = text.lower()
+    if len(lowered) != len(text):
+        lowered = ''.join(char.lower()[:1] for char in text)
+    return lowered
+
+# Matcher multi-pattern (Aho-Corasick) - dibangun sekali saat import
+# Semua keyword di-dedupe, tiap keyword dipetakan ke set aspeknya, lalu teks
+# cukup di-scan satu kali (linear terhadap panjang teks, bukan jumlah keyword)
+class KeywordMatcher:
+    def __init__(self, keyword_dict):
+        phrase_aspects = {}
+        for aspect, keywords in keyword_dict.items():
+            for keyword in keywords:
+                phrase_aspects.setdefault(keyword, set()).add(aspect)
+
+        self.phrase_aspects = phrase_aspects
+        self.aspect_order = list(keyword_dict)
+        self.always = set()  # Keyword kosong selalu cocok ('' in text == True)
+
+        # Trie: goto[state] = {char: next_state}, output[state] = set aspek,
+        # output_phrases[state] = keyword yang berakhir di state ini (untuk span)
+        self.goto = [{}]
+        self.output = [set()]
+        self.output_phrases = [[]]
+        for phrase, aspects in phrase_aspects.items():
+            if not phrase:
+                self.always |= aspects
+                continue
+            state = 0
+            for char in phrase:
+                next_state = self.goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self.goto)
+                    self.goto[state][char] = next_state
+                    self.goto.append({})
+                    self.output.append(set())
+                    self.output_phrases.append([])
+                state = next_state
+            self.output[state] |= aspects
+            self.output_phrases[state].append(phrase)
+
+        # Failure link (BFS), output digabung sepanjang rantai failure
+        self.fail = [0] * len(self.goto)
+        queue = list(self.goto[0].values())
+        for state in queue:
+            for char, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[next_state] = self.goto[fallback].get(char, 0)
+                self.output[next_state] |= self.output[self.fail[next_state]]
+                self.output_phrases[next_state] += self.output_phrases[self.fail[next_state]]
+
+    # Satu kali scan; kalau spans berupa list, keyword yang cocok ikut dicatat di sana
+    def scan(self, text, spans=None):
+        goto, fail, output = self.goto, self.fail, self.output
+        found = set(self.always)
+        state = 0
+        for position, char in enumerate(lower_text(text)):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                found |= output[state]
+                if spans is not None:
+                    for phrase in self.output_phrases[state]:
+                        for aspect in sorted(self.phrase_aspects[phrase]):
+                            spans.append(MatchSpan(aspect, phrase, position + 1 - len(phrase), position + 1))
+        return found
+
+    def match(self, text):
+        return self.scan(text)
+
+    # Keyword yang dilaporkan di span untuk keyword ini
+    def canonical(self, keyword):
+        return keyword
+
+    # Hasil sebagai list dengan urutan aspek di dictionary (deterministik antar proses,
+    # tidak bergantung pada hash seed seperti list(set(...))).
+    # with_spans=True -> (aspek, span) dari scan yang sama; span urut posisi, yang terpanjang dulu
+    def match_list(self, text, with_spans=False):
+        spans = [] if with_spans else None
+        found = self.scan(text, spans)
+        aspects = [aspect for aspect in self.aspect_order if aspect in found]
+        if with_spans:
+            return aspects, sorted(spans, key=lambda span: (span.start, -span.end))
+        return aspects
+
+# Normalisasi teks untuk matcher berbasis token: lowercase, buang URL dan mention,
+# huruf yang diulang 3+ kali untuk penekanan dipadatkan ('bangeeet' -> 'banget').
+# Huruf ganda dibiarkan ('staff', 'app', 'tunggu'); ejaan penekanan dengan huruf ganda
+# di akhir ('bangett') dicantumkan eksplisit di forms keyword-nya.
+# Keyword dinormalisasi dengan cara yang sama jadi tetap konsisten.
+URL_PATTERN = re.compile(r"https?://\S+|www\.\S+")
+MENTION_PATTERN = re.compile(r"@\w+")
+REPEAT_PATTERN = re.compile(r"([a-z])\1{2,}")
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+@functools.lru_cache(maxsize=200000)
+def collapse_repeats(token):
+    return REPEAT_PATTERN.sub(r"\1", token)
+
+# Token beserta posisinya di teks asli: list (token, start, end).
+# URL/mention diganti spasi sepanjang aslinya supaya posisi tidak bergeser.
+def tokenize(text):
+    blank = lambda m: " " * len(m.group())
+    text = lower_text(text)
+    if "http" in text or "www." in text:
+        text = URL_PATTERN.sub(blank, text)
+    if "@" in text:
+        text = MENTION_PATTERN.sub(blank, text)
+    return [(collapse_repeats(m.group()), m.start(), m.end()) for m in TOKEN_PATTERN.finditer(text)]
+
+def normalize_tokens(text):
+    return [token for token, _, _ in tokenize(text)]
+
+# Matcher n-gram kata: keyword ditokenisasi jadi tuple kata dan disimpan di dict
+# (hash index). Teks di-scan per posisi kata; perpanjangan n-gram berhenti begitu
+# tuple bukan prefix keyword mana pun, jadi biaya ~ panjang tweet, bukan ukuran
+# dictionary. Cocok hanya di batas kata ('dana' tidak cocok di 'kedanan'); bentuk
+# berimbuhan hanya cocok kalau tercantum di forms keyword-nya.
+class TokenMatcher:
+    def __init__(self, keyword_dict, forms=None):
+        forms = forms or {}
+        self.aspect_order = list(keyword_dict)
+        self.phrases = {}     # tuple token -> set aspek
+        self.keywords = {}    # tuple token -> keyword asli (yang pertama di dictionary)
+        self.prefixes = set() # semua prefix sejati dari tuple keyword
+        self.always = set()
+        for aspect, keywords in keyword_dict.items():
+            for keyword in keywords:
+                for variant in [keyword] + forms.get(keyword, []):
+                    tokens = tuple(normalize_tokens(variant))
+                    if not tokens:
+                        self.always.add(aspect)
+                        continue
+                    self.phrases.setdefault(tokens, set()).add(aspect)
+                    self.keywords.setdefault(tokens, keyword)
+                    for end in range(1, len(tokens)):
+                        self.prefixes.add(tokens[:end])
+
+    def _hit(self, gram, positions, spans):
+        for aspect in sorted(self.phrases[gram]):
+            spans.append(MatchSpan(aspect, self.keywords[gram], positions[0], positions[1]))
+
+    # tokens: list (token, start, end) dari tokenize()
+    def scan_tokens(self, tokens, spans=None):
+        phrases, prefixes = self.phrases, self.prefixes
+        found = set(self.always)
+        words = [token for token, _, _ in tokens]
+        for start in range(len(words)):
+            gram = ()
+            for end in range(start, len(words)):
+                gram += (words[end],)
+                aspects = phrases.get(gram)
+                if aspects:
+                    found |= aspects
+                    if spans is not None:
+                        self._hit(gram, (tokens[start][1], tokens[end][2]), spans)
+                if gram not in prefixes:
+                    break
+        return found
+
+    def scan(self, text, spans=None):
+        return self.scan_tokens(tokenize(text), spans)
+
+    def match(self, text):
+        return self.scan(text)
+
+    # Keyword yang dinormalisasi sama ('Macet' / 'macet') dilaporkan sebagai keyword pertamanya
+    def canonical(self, keyword):
+        return self.keywords.get(tuple(normalize_tokens(keyword)), keyword)
+
+    def match_list(self, text, with_spans=False):
+        spans = [] if with_spans else None
+        found = self.scan(text, spans)
+        aspects = [aspect for aspect in self.aspect_order if aspect in found]
+        if with_spans:
+            return aspects, sorted(spans, key=lambda span: (span.start, -span.end))
+        return aspects
+
+# Mode matcher: "token" (n-gram kata, default) atau "substring" (Aho-Corasick, perilaku lama)
+KEYWORD_MATCHER = os.environ.get("KEYWORD_MATCHER", "token")
+
+# Versi dictionary: hash isi keyword + mode matcher, berubah kalau file dictionary
+# diedit atau cara pencocokan diganti (hasil cache lama jadi tidak valid)
+def keywords_version(good_keywords, problem_keywords, matcher=KEYWORD_MATCHER, good_forms=None, problem_forms=None):
+    payload = json.dumps([good_keywords, problem_keywords, matcher, good_forms or {}, problem_forms or {}],
+                         sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()[:12]
+
+# Dictionary yang sudah dikompilasi jadi matcher. Tidak diubah setelah dibuat; reload
+# membuat KeywordSet baru lalu menukar referensinya, jadi satu panggilan deteksi selalu
+# memakai satu versi dictionary yang utuh.
+class KeywordSet:
+    def __init__(self, good_keywords, problem_keywords, matcher=KEYWORD_MATCHER, file_versions=None,
+                 good_forms=None, problem_forms=None):
+        self.good_keywords = good_keywords
+        self.problem_keywords = problem_keywords
+        self.good_forms = good_forms or {}
+        self.problem_forms = problem_forms or {}
+        self.file_versions = file_versions or {}
+        self.version = keywords_version(good_keywords, problem_keywords, matcher, self.good_forms, self.problem_forms)
+        if matcher == "substring":
+            # Substring sudah mencocokkan bentuk berimbuhan, forms tidak dipakai
+            self.good_matcher = KeywordMatcher(good_keywords)
+            self.problem_matcher = KeywordMatcher(problem_keywords)
+        else:
+            self.good_matcher = TokenMatcher(good_keywords, self.good_forms)
+            self.problem_matcher = TokenMatcher(problem_keywords, self.problem_forms)
+
+    def detect_good_aspects(self, text, with_spans=False):
+        return self.good_matcher.match_list(text, with_spans)
+
+    def detect_problems(self, text, with_spans=False):
+        return self.problem_matcher.match_list(text, with_spans)
+
+    def detect_aspects(self, text, sentiment, with_spans=False):
+        if sentiment == "Negatif":
+            return self.detect_problems(text, with_spans)
+        return self.detect_good_aspects(text, with_spans)
+
+
+def load_keyword_set(directory=KEYWORDS_DIR):
+    paths = keyword_paths(directory)
+    good_version, good, good_forms = load_keyword_file(paths['good'])
+    problem_version, problem, problem_forms = load_keyword_file(paths['problem'])
+    return KeywordSet(good, problem, file_versions={'good': good_version, 'problem': problem_version},
+                      good_forms=good_forms, problem_forms=problem_forms)
+
+
+_reload_lock = threading.Lock()
+
+# Pasang KeywordSet aktif. Nama modul lama (good_keywords, problem_matcher, KEYWORDS_VERSION, ...)
+# ikut diperbarui untuk pemakai yang membaca lewat modul (mis. keywords.KEYWORDS_VERSION di result_cache).
+def _activate(keyword_set):
+    global _active, good_keywords, problem_keywords, good_matcher, problem_matcher, KEYWORDS_VERSION
+    _active = keyword_set
+    good_keywords, problem_keywords = keyword_set.good_keywords, keyword_set.problem_keywords
+    good_matcher, problem_matcher = keyword_set.good_matcher, keyword_set.problem_matcher
+    KEYWORDS_VERSION = keyword_set.version
+
+_activate(load_keyword_set())
+
+def active_keywords():
+    return _active
+
+# Baca ulang file dictionary dan tukar matcher kalau isinya berubah.
+# Kompilasi dilakukan sebelum swap; file yang rusak -> exception, matcher lama tetap dipakai.
+def reload_keywords(directory=KEYWORDS_DIR):
+    keyword_set = load_keyword_set(directory)
+    with _reload_lock:
+        if keyword_set.version == _active.version:
+            return False
+        _activate(keyword_set)
+    return True
+
+# Pantau mtime file dictionary (polling, tanpa dependency tambahan) dan reload saat berubah.
+# listeners dipanggil dengan KeywordSet baru setelah swap (mis. untuk re-tag dataset).
+class KeywordWatcher:
+    def __init__(self, directory=KEYWORDS_DIR, interval=2.0):
+        self.directory = directory
+        self.interval = interval
+        self.reloads = 0
+        self.last_error = None
+        self.listeners = []
+        self._stamp = self._file_stamp()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _file_stamp(self):
+        stamp = []
+        for path in keyword_paths(self.directory).values():
+            try:
+                stat = os.stat(path)
+                stamp.append((stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                stamp.append(None)
+        return tuple(stamp)
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="keyword-watcher", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.check()
+
+    def check(self):
+        stamp = self._file_stamp()
+        if stamp == self._stamp:
+            return False
+        self._stamp = stamp
+        try:
+            changed = reload_keywords(self.directory)
+        except (OSError, ValueError) as e:
+            # File setengah tersimpan / JSON rusak: tetap pakai dictionary lama
+            self.last_error = repr(e)
+            return False
+        self.last_error = None
+        if changed:
+            self.reloads += 1
+            for listener in self.listeners:
+                listener(_active)
+        return changed
+
+# Fungsi untuk deteksi good aspects (positif/netral)
+# with_spans=True -> (aspek, list MatchSpan) dari scan yang sama
+def detect_good_aspects(text, with_spans=False):
+    return _active.detect_good_aspects(text, with_spans)
+
+# Fungsi untuk deteksi problem
+def detect_problems(text, with_spans=False):
+    return _active.detect_problems(text, with_spans)
+
+# Aspek sesuai sentimen: Negatif -> masalah, Positif -> aspek baik
+def detect_aspects(text, sentiment, with_spans=False):
+    return _active.detect_aspects(text, sentiment, with_spans)
+
+# Profil hit per keyword di sekumpulan teks, untuk memangkas keyword mati / terlalu sering cocok.
+# Hasil: Counter {(aspek, keyword): jumlah tweet yang memicu keyword itu}
+def keyword_hits(texts, matcher):
+    hits = Counter()
+    for text in texts:
+        spans = []
+        matcher.scan(text, spans)
+        hits.update({(span.aspect, span.keyword) for span in spans})
+    return hits
@@ -0,0 +1,71 @@
+import ast
+
+import pandas as pd
+
+# List aspek "rapi" seperti "['Harga', 'Kecepatan Layanan']" - bisa di-parse dengan string ops saja
+WELL_FORMED_PATTERN = r"\[\s*(?:'[^',\\]*'(?:\s*,\s*'[^',\\]*')*)?\s*\]"
+
+# Preprocess problem data - FIXED VERSION
+def preprocess_problems(problem_str):
+    if pd.isna(problem_str) or problem_str == '[]' or problem_str == '':
+        return []
+
+    try:
+        # Coba parsing sebagai Python list
+        if isinstance(problem_str, str) and problem_str.startswith('['):
+            try:
+                problems = ast.literal_eval(problem_str)
+                if isinstance(problems, list):
+                    return [str(p).strip() for p in problems if p and str(p).strip()]
+            except:
+                pass
+
+        # Fallback: manual parsing
+        if isinstance(problem_str, str):
+            # Remove brackets and quotes
+            clean_str = problem_str.strip("[]'\" ")
+            if clean_str:
+                # Split by comma and clean
+                problems = [p.strip().strip("'\"") for p in clean_str.split(',')]
+                return [p for p in problems if p]
+
+        return []
+    except Exception as e:
+        return []
+
+# Parse kolom problem jadi tabel panjang (row_id, aspect) dengan dtype category.
+# row_id = posisi baris (0..n-1) di series input.
+def explode_problems(problem_series):
+    values = problem_series.reset_index(drop=True)
+    text = values.astype('string')
+    well_formed = text.str.fullmatch(WELL_FORMED_PATTERN).fillna(False).astype(bool)
+
+    # Jalur cepat: buang kurung, split koma, strip spasi/kutip
+    items = (
+        text[well_formed].str.slice(1, -1).str.split(',')
+        .explode().str.strip().str.strip("'\"").str.strip()
+    )
+    items = items[items.notna() & (items != '')]
+    parts = [pd.DataFrame({'row_id': items.index.to_numpy(), 'aspect': items.to_numpy(dtype=object)})]
+
+    # Fallback hanya untuk baris yang tidak rapi (dan bukan NaN/kosong)
+    malformed = values[~well_formed & values.notna()]
+    if not malformed.empty:
+        row_ids, aspects = [], []
+        for row_id, problem_str in malformed.items():
+            for aspect in preprocess_problems(problem_str):
+                row_ids.append(row_id)
+                aspects.append(aspect)
+        parts.append(pd.DataFrame({'row_id': row_ids, 'aspect': aspects}))
+
+    table = pd.concat(parts, ignore_index=True).sort_values('row_id', kind='stable', ignore_index=True)
+    table['row_id'] = table['row_id'].astype('int64')
+    table['aspect'] = table['aspect'].astype('category')
+    return table
+
+# Kembalikan ke bentuk list per baris (untuk kode yang masih butuh problems_clean)
+def problems_lists(table, n_rows):
+    lists = [[] for _ in range(n_rows)]
+    for row_id, aspect in zip(table['row_id'].to_numpy(), table['aspect'].to_numpy()):
+        lists[row_id].append(aspect)
+    return lists
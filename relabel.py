@@ -0,0 +1,249 @@
+"""Relabel tweet mentah secara offline (tanpa Streamlit).
+
+Contoh:
+    python relabel.py raw_tweets.csv final_df.csv
+    python relabel.py scrape.jsonl labelled.jsonl --chunk-size 5000 --batch-size 64
+
+Input dibaca per chunk, dilabel per batch, dan output ditulis bertahap.
+Progress disimpan di `<output>.ckpt`; kalau proses terhenti, jalankan ulang
+perintah yang sama untuk melanjutkan dari chunk terakhir yang selesai. Checkpoint
+mencatat file input (path, ukuran, mtime) dan parameter labelling; kalau berbeda,
+resume ditolak (pakai --no-resume untuk mulai dari awal).
+
+Dengan --workers N, chunk dibagi ke N proses (masing-masing memuat model dan
+keyword matcher sekali); hasil tetap ditulis berurutan oleh satu proses.
+
+Tweet duplikat dan near-duplicate (retweet, repost bot, beda URL t.co) dalam satu
+chunk hanya dilabel sekali lewat wakil cluster-nya (dedup.py); --no-dedup mematikannya.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+from collections import deque
+
+import pandas as pd
+import torch
+
+import keywords
+from dedup import fan_out
+from keywords import detect_aspects
+from backends import BACKENDS
+from sentiment import DEFAULT_BACKEND, LEXICON_MODEL_ID, MODEL_NAME, analyze_sentiment_batch, load_model
+
+
+# Label satu DataFrame: isi kolom Sentiment dan problem (format sama dengan final_df.csv).
+# Dengan dedup, hanya wakil tiap cluster duplikat yang dilabel; anggotanya ikut labelnya.
+def label_frame(df, tokenizer, model, text_column='Tweet', batch_size=32, dedup=True):
+    df = df.copy()
+    texts = df[text_column].fillna('').astype(str).tolist()
+
+    def label(batch):
+        results = analyze_sentiment_batch(batch, tokenizer, model, batch_size=batch_size)
+        return [(sentiment, str(detect_aspects(text, sentiment))) for text, (sentiment, _) in zip(batch, results)]
+
+    labels = fan_out(texts, label) if dedup else label(texts)
+    df['Sentiment'] = [sentiment for sentiment, _ in labels]
+    df['problem'] = [problem for _, problem in labels]
+    return df
+
+
+# State per proses worker (diisi sekali oleh _init_worker)
+_worker_tokenizer = None
+_worker_model = None
+
+
+def _init_worker(model_name, backend, num_threads, use_model):
+    global _worker_tokenizer, _worker_model
+    # Batasi thread torch per worker supaya N worker tidak saling berebut core
+    torch.set_num_threads(num_threads)
+    if use_model:
+        try:
+            _worker_tokenizer, _worker_model = load_model(model_name, backend)
+        except Exception as e:
+            print(f"Error loading model di worker {os.getpid()}: {e}. Menggunakan fallback lexicon...", file=sys.stderr)
+
+
+def _label_chunk(chunk, text_column, batch_size, dedup):
+    return label_frame(chunk, _worker_tokenizer, _worker_model, text_column=text_column, batch_size=batch_size,
+                       dedup=dedup)
+
+
+# Label chunk di pool proses. Hasil dikembalikan berurutan; jumlah chunk yang sedang
+# diproses dibatasi (max_in_flight) supaya file besar tidak terbaca semua ke memori.
+def label_chunks_parallel(chunks, workers, model_name=MODEL_NAME, backend=DEFAULT_BACKEND, use_model=True,
+                          text_column='Tweet', batch_size=32, dedup=True, threads_per_worker=None, max_in_flight=None):
+    threads_per_worker = threads_per_worker or max(1, (os.cpu_count() or 1) // workers)
+    max_in_flight = max_in_flight or workers * 2
+
+    context = multiprocessing.get_context('spawn')
+    with context.Pool(workers, initializer=_init_worker,
+                      initargs=(model_name, backend, threads_per_worker, use_model)) as pool:
+        in_flight = deque()
+        for chunk in chunks:
+            in_flight.append(pool.apply_async(_label_chunk, (chunk, text_column, batch_size, dedup)))
+            if len(in_flight) >= max_in_flight:
+                yield in_flight.popleft().get()
+        while in_flight:
+            yield in_flight.popleft().get()
+
+
+def _is_jsonl(path):
+    return path.endswith('.jsonl') or path.endswith('.json')
+
+
+def read_chunks(path, chunk_size, skip_rows=0):
+    if _is_jsonl(path):
+        reader = pd.read_json(path, lines=True, chunksize=chunk_size, dtype=False)
+    else:
+        reader = pd.read_csv(path, chunksize=chunk_size)
+
+    # Lewati baris yang sudah selesai (dihitung per record, bukan per baris file,
+    # karena tweet bisa berisi newline di dalam field CSV)
+    for chunk in reader:
+        if skip_rows >= len(chunk):
+            skip_rows -= len(chunk)
+            continue
+        yield chunk.iloc[skip_rows:]
+        skip_rows = 0
+
+
+# Checkpoint milik input / parameter lain: resume akan mencampur output dari sumber berbeda
+class CheckpointMismatch(ValueError):
+    pass
+
+
+def load_checkpoint(path):
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+# Identitas run: file input + parameter yang menentukan isi output. Resume hanya aman
+# kalau semuanya sama dengan run yang menulis checkpoint.
+def run_identity(input_path, chunk_size, text_column, dedup, model_id):
+    stat = os.stat(input_path)
+    return {
+        'input': {'path': os.path.abspath(input_path), 'size': stat.st_size, 'mtime': stat.st_mtime},
+        'params': {'chunk_size': chunk_size, 'text_column': text_column, 'dedup': dedup,
+                   'model_id': model_id, 'keywords_version': keywords.active_keywords().version},
+    }
+
+
+def save_checkpoint(path, state):
+    # Tulis ke file sementara lalu rename supaya checkpoint tidak pernah setengah jadi
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(state, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def write_chunk(df, path, header):
+    with open(path, 'a', encoding='utf-8', newline='') as f:
+        if _is_jsonl(path):
+            df.to_json(f, orient='records', lines=True, force_ascii=False)
+        else:
+            df.to_csv(f, index=False, header=header)
+        f.flush()
+        os.fsync(f.fileno())
+        return f.tell()
+
+
+# model_id: identitas model untuk checkpoint (default dari model yang diberikan)
+def relabel(input_path, output_path, tokenizer, model, chunk_size=1000, batch_size=32,
+            text_column='Tweet', resume=True, workers=1, dedup=True, model_id=None, **pool_options):
+    checkpoint_path = output_path + '.ckpt'
+    if model_id is None:
+        model_id = LEXICON_MODEL_ID if model is None else type(model).__name__
+    identity = run_identity(input_path, chunk_size, text_column, dedup, model_id)
+    state = load_checkpoint(checkpoint_path) if resume else None
+    if state and state['rows_done']:
+        changed = [name for name in identity if state.get(name) != identity[name]]
+        if changed:
+            raise CheckpointMismatch(
+                f"Checkpoint {checkpoint_path} dibuat dengan {' dan '.join(changed)} yang berbeda "
+                f"(tersimpan: {[state.get(name) for name in changed]}). "
+                "Pakai --no-resume untuk mulai dari awal."
+            )
+    else:
+        state = {'rows_done': 0, 'output_bytes': 0}
+    state.update(identity)
+
+    # Buang output yang tertulis setelah checkpoint terakhir (chunk yang belum tercatat)
+    if state['rows_done'] and os.path.exists(output_path):
+        with open(output_path, 'r+b') as f:
+            f.truncate(state['output_bytes'])
+    elif os.path.exists(output_path):
+        os.remove(output_path)
+
+    chunks = read_chunks(input_path, chunk_size, skip_rows=state['rows_done'])
+    if workers > 1:
+        labelled_chunks = label_chunks_parallel(chunks, workers, text_column=text_column,
+                                                batch_size=batch_size, dedup=dedup, **pool_options)
+    else:
+        labelled_chunks = (
+            label_frame(chunk, tokenizer, model, text_column=text_column, batch_size=batch_size, dedup=dedup)
+            for chunk in chunks
+        )
+
+    for labelled in labelled_chunks:
+        state['output_bytes'] = write_chunk(labelled, output_path, header=state['rows_done'] == 0)
+        state['rows_done'] += len(labelled)
+        save_checkpoint(checkpoint_path, state)
+        print(f"{state['rows_done']} baris selesai", file=sys.stderr)
+
+    return state['rows_done']
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Relabel tweet mentah (CSV/JSONL) dengan model sentimen dan keyword aspek.")
+    parser.add_argument('input', help="File CSV atau JSONL berisi tweet mentah")
+    parser.add_argument('output', help="File hasil (.csv atau .jsonl)")
+    parser.add_argument('--text-column', default='Tweet')
+    parser.add_argument('--chunk-size', type=int, default=1000, help="Jumlah baris per chunk yang dibaca/ditulis")
+    parser.add_argument('--batch-size', type=int, default=32, help="Ukuran micro-batch untuk model")
+    parser.add_argument('--model', default=MODEL_NAME)
+    parser.add_argument('--backend', choices=BACKENDS, default=DEFAULT_BACKEND, help="Backend inference model")
+    parser.add_argument('--no-model', action='store_true', help="Pakai fallback lexicon tanpa memuat model")
+    parser.add_argument('--workers', type=int, default=1, help="Jumlah proses worker (1 = tanpa pool)")
+    parser.add_argument('--threads-per-worker', type=int, default=None,
+                        help="Thread torch per worker (default: jumlah core / workers)")
+    parser.add_argument('--no-dedup', action='store_true', help="Label setiap baris, termasuk duplikat/retweet")
+    parser.add_argument('--no-resume', action='store_true', help="Abaikan checkpoint dan mulai dari awal")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    tokenizer, model = None, None
+    # Dengan pool, model dimuat di masing-masing worker, bukan di proses utama
+    if not args.no_model and args.workers <= 1:
+        try:
+            tokenizer, model = load_model(args.model, args.backend)
+        except Exception as e:
+            print(f"Error loading model: {e}. Menggunakan fallback lexicon...", file=sys.stderr)
+
+    # Dengan pool model dimuat di worker; ID memakai model yang diminta
+    use_model = not args.no_model and (args.workers > 1 or model is not None)
+    model_id = f"{args.model}:{args.backend}" if use_model else LEXICON_MODEL_ID
+    try:
+        total = relabel(
+            args.input, args.output, tokenizer, model,
+            chunk_size=args.chunk_size, batch_size=args.batch_size,
+            text_column=args.text_column, resume=not args.no_resume, workers=args.workers, dedup=not args.no_dedup,
+            model_id=model_id, model_name=args.model, backend=args.backend, use_model=not args.no_model,
+            threads_per_worker=args.threads_per_worker,
+        )
+    except CheckpointMismatch as e:
+        print(f"❌ {e}", file=sys.stderr)
+        sys.exit(1)
+    print(f"✅ {total} baris ditulis ke {args.output}", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
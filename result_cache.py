@@ -0,0 +1,141 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+import keywords
+from sentiment import LEXICON_MODEL_ID, analyze_sentiment
+
+
+# Normalisasi untuk key cache: lowercase + rapikan spasi
+def normalize_text(text):
+    return " ".join(str(text).lower().split())
+
+
+# Cache hasil analisis (sentiment, confidence, aspects) per teks.
+# Key = hash(teks ternormalisasi + model_id + versi keyword), jadi ganti model
+# atau edit dictionary keyword otomatis membuat entry lama tidak terpakai.
+# Tier memori berupa LRU terbatas; tier SQLite opsional supaya tahan restart.
+class AnalysisCache:
+    def __init__(self, max_entries=10000, db_path=None):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+        self.db = None
+        if db_path:
+            os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+            self.db = sqlite3.connect(db_path, check_same_thread=False)
+            self.db.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                " key TEXT PRIMARY KEY, keywords_version TEXT, sentiment TEXT,"
+                " confidence REAL, aspects TEXT, created REAL)"
+            )
+            # Entry dari dictionary keyword versi lama tidak akan pernah kena hit lagi
+            self.db.execute("DELETE FROM results WHERE keywords_version != ?", (keywords.KEYWORDS_VERSION,))
+            self.db.commit()
+
+    # keywords_version None = versi dictionary aktif saat ini
+    @staticmethod
+    def key(text, model_id, keywords_version=None):
+        payload = "\0".join([model_id, keywords_version or keywords.KEYWORDS_VERSION, normalize_text(text)])
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+    def get(self, text, model_id, keywords_version=None):
+        key = self.key(text, model_id, keywords_version)
+        with self._lock:
+            value = self.entries.get(key)
+            if value is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return value
+
+            if self.db is not None:
+                row = self.db.execute(
+                    "SELECT sentiment, confidence, aspects FROM results WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    value = (row[0], row[1], json.loads(row[2]))
+                    self._remember(key, value)
+                    self.disk_hits += 1
+                    return value
+
+            self.misses += 1
+            return None
+
+    def put(self, text, model_id, value, keywords_version=None):
+        keywords_version = keywords_version or keywords.KEYWORDS_VERSION
+        key = self.key(text, model_id, keywords_version)
+        with self._lock:
+            self._remember(key, value)
+            if self.db is not None:
+                sentiment, confidence, aspects = value
+                self.db.execute(
+                    "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, keywords_version, sentiment, confidence, json.dumps(aspects), time.time()),
+                )
+                self.db.commit()
+
+    def _remember(self, key, value):
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    # Kosongkan LRU dan baris SQLite dictionary versi aktif (versi lain sudah dibuang saat init),
+    # supaya hasil lama tidak muncul lagi lewat disk hit setelah clear
+    def clear(self):
+        with self._lock:
+            self.entries.clear()
+            if self.db is not None:
+                self.db.execute("DELETE FROM results WHERE keywords_version = ?", (keywords.KEYWORDS_VERSION,))
+                self.db.commit()
+
+    def stats(self):
+        lookups = self.hits + self.disk_hits + self.misses
+        return {
+            "size": len(self.entries),
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+        }
+
+
+# Analisis satu komentar lewat cache: sentimen + aspek sesuai sentimen.
+# Satu KeywordSet dipakai dari lookup sampai simpan, jadi reload dictionary di tengah
+# analisis tidak menyimpan tag versi lama di bawah key versi baru.
+# server (BatchingInferenceServer, opsional): cache miss dikirim ke server micro-batching
+# supaya request dari banyak sesi digabung jadi satu forward pass.
+# with_spans=True -> (sentiment, confidence, aspek, span keyword). Span tidak di-cache karena
+# posisinya milik teks persis ini (key cache memakai teks ternormalisasi); saat miss span
+# berasal dari scan deteksi aspek yang sama, saat hit teks di-scan sekali untuk span-nya.
+def analyze_cached(cache, text, tokenizer, model, model_id, server=None, with_spans=False):
+    if model is None:
+        # Hasil lexicon tidak boleh tersimpan di bawah ID model asli
+        model_id = LEXICON_MODEL_ID
+    keyword_set = keywords.active_keywords()
+    value = cache.get(text, model_id, keyword_set.version)
+    spans = None
+    if value is None:
+        if server is not None and model is not None:
+            sentiment, confidence = server.analyze(text)
+        else:
+            sentiment, confidence = analyze_sentiment(text, tokenizer, model)
+        aspects, spans = keyword_set.detect_aspects(text, sentiment, with_spans=True)
+        value = (sentiment, confidence, aspects)
+        cache.put(text, model_id, value, keyword_set.version)
+    if not with_spans:
+        return value
+    if spans is None:
+        spans = keyword_set.detect_aspects(text, value[0], with_spans=True)[1]
+    return value + (spans,)
@@ -0,0 +1,120 @@
+import queue
+import threading
+
+import numpy as np
+import pandas as pd
+
+import keywords
+
+
+# Re-tag partisi dataset dasar di background dengan dictionary dan matcher aktif.
+# Tag di CSV dibuat dengan pencocokan substring (baseline_version = dictionary saat app start
+# + matcher substring). Selama versi aktif sama dengan itu, tag CSV yang dipakai; kalau matcher
+# aktif lain (default token) atau dictionary di-reload, tiap partisi dilabel ulang per chunk
+# dengan KeywordSet yang sama dari awal sampai akhir, supaya dataset dasar dan komentar baru
+# memakai semantik tag yang sama. Hasil baru dipakai setelah lengkap (sebelumnya tag lama tampil).
+class Retagger:
+    def __init__(self, chunk_size=500):
+        self.chunk_size = chunk_size
+        active = keywords.active_keywords()
+        self.baseline_version = keywords.keywords_version(
+            active.good_keywords, active.problem_keywords, "substring", active.good_forms, active.problem_forms
+        )
+        self.partitions = {}   # kategori -> (fingerprint, df) terakhir yang dilihat dashboard
+        self.results = {}      # (kategori, fingerprint, versi) -> (df, tabel aspek)
+        self.progress = {}     # (kategori, fingerprint, versi) -> baris selesai
+        self.failed = {}       # (kategori, fingerprint, versi) -> error; tidak dijadwalkan ulang untuk versi ini
+        self.errors = 0
+        self.last_error = None
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="keyword-retag", daemon=True)
+        self._thread.start()
+
+    # Catat partisi yang sedang dilihat, supaya ikut di-re-tag saat dictionary berubah
+    def register(self, category, fingerprint, df):
+        with self._lock:
+            self.partitions[category] = (fingerprint, df)
+
+    # (df, tabel aspek) hasil re-tag untuk versi dictionary, atau None kalau belum selesai / gagal
+    # (job dijadwalkan kalau belum ada dan belum pernah gagal untuk versi ini)
+    def get(self, category, fingerprint, df, version):
+        key = (category, fingerprint, version)
+        with self._lock:
+            self.partitions[category] = (fingerprint, df)
+            result = self.results.get(key)
+            if result is None and key not in self.progress and key not in self.failed:
+                self.progress[key] = 0
+                self._queue.put((key, df))
+        return result
+
+    # Dipanggil KeywordWatcher setelah reload: re-tag semua partisi yang pernah dilihat
+    def schedule(self, keyword_set):
+        with self._lock:
+            partitions = list(self.partitions.items())
+            # Versi baru: kegagalan versi lama tidak relevan lagi
+            self.failed = {key: error for key, error in self.failed.items() if key[2] == keyword_set.version}
+            if not self.failed:
+                self.last_error = None
+        for category, (fingerprint, df) in partitions:
+            self.get(category, fingerprint, df, keyword_set.version)
+
+    # Jumlah baris yang sudah di-re-tag, atau None kalau tidak ada job berjalan untuk versi ini
+    def status(self, category, fingerprint, version):
+        with self._lock:
+            return self.progress.get((category, fingerprint, version))
+
+    # Error re-tag partisi ini untuk versi dictionary ini, atau None
+    def error(self, category, fingerprint, version):
+        with self._lock:
+            return self.failed.get((category, fingerprint, version))
+
+    def _run(self):
+        while True:
+            key, df = self._queue.get()
+            keyword_set = keywords.active_keywords()
+            if keyword_set.version != key[2]:
+                # Dictionary sudah berganti lagi; job versi terbaru dijadwalkan terpisah
+                with self._lock:
+                    self.progress.pop(key, None)
+                continue
+            try:
+                result = self.retag(key, df, keyword_set)
+            except Exception as e:
+                with self._lock:
+                    self.errors += 1
+                    self.last_error = repr(e)
+                    self.failed[key] = repr(e)
+                    self.progress.pop(key, None)
+                continue
+            with self._lock:
+                # Hanya simpan versi terbaru per kategori
+                for old in [old for old in self.results if old[0] == key[0]]:
+                    del self.results[old]
+                self.results[key] = result
+                self.progress.pop(key, None)
+
+    def retag(self, key, df, keyword_set):
+        texts = df['Tweet'].astype(str).to_numpy()
+        sentiments = df['Sentiment'].astype(str).to_numpy()
+        problems = []
+        spans = []
+        for start in range(0, len(df), self.chunk_size):
+            for text, sentiment in zip(texts[start:start + self.chunk_size], sentiments[start:start + self.chunk_size]):
+                aspects, matches = keyword_set.detect_aspects(text, sentiment, with_spans=True)
+                problems.append(aspects)
+                spans.append(matches)
+            with self._lock:
+                self.progress[key] = min(start + self.chunk_size, len(df))
+
+        retagged = df.copy()
+        retagged['problem'] = [str(aspects) for aspects in problems]
+        retagged['problems_clean'] = problems
+        retagged['spans'] = spans  # Span keyword dari scan yang sama, untuk highlight feed
+        # Tabel panjang (row_id, aspect) sama seperti problems.explode_problems
+        lengths = np.fromiter((len(aspects) for aspects in problems), dtype=np.int64, count=len(problems))
+        aspect_table = pd.DataFrame({
+            'row_id': np.repeat(np.arange(len(problems), dtype=np.int64), lengths),
+            'aspect': pd.Categorical([aspect for aspects in problems for aspect in aspects]),
+        })
+        return retagged, aspect_table
@@ -0,0 +1,210 @@
+import os
+import re
+import threading
+import time
+
+import numpy as np
+import torch
+# from transformers import AutoTokenizer, AutoModelForSequenceClassification
+from transformers import BertTokenizer, BertForSequenceClassification
+
+from backends import build_backend
+
+# pyarrow (RE2) untuk scoring lexicon satu batch sekaligus; tanpa itu dipakai loop per teks
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    HAS_ARROW = True
+except ImportError:
+    HAS_ARROW = False
+
+# model_name = "w11wo/indobert-large-p1-twitter-indonesia-sarcastic"
+# model_name = "w11wo/indonesian-roberta-base-sentiment-classifier"
+MODEL_NAME = "agufsamudra/indo-sentiment-analysis"
+# Backend inference: "torch" (fp32), "int8" (dynamic quantization), "onnx" (onnxruntime)
+DEFAULT_BACKEND = os.environ.get("SENTIMENT_BACKEND", "torch")
+
+# Mapping untuk model ini: 0=Negative, 1=Positive
+# Karena trial_df hanya punya Positif & Negatif, kita HILANGKAN Netral
+SENTIMENT_LABELS = ["Negatif", "Positif"]  # Hanya 2 kelas
+
+# model_id untuk hasil fallback lexicon (key cache hasil)
+LEXICON_MODEL_ID = "lexicon"
+
+# Load model HuggingFace (tanpa Streamlit, dipakai app dan CLI)
+def load_model(model_name=MODEL_NAME, backend=DEFAULT_BACKEND):
+    tokenizer = BertTokenizer.from_pretrained(model_name)
+    model = BertForSequenceClassification.from_pretrained(model_name)
+    model.eval()
+    return tokenizer, build_backend(tokenizer, model, backend, model_name)
+
+# Load model di background thread supaya dashboard bisa render duluan.
+# Selama belum siap, get() mengembalikan (None, None) -> analyze_sentiment pakai fallback lexicon.
+class BackgroundModelLoader:
+    def __init__(self, model_name=MODEL_NAME, backend=DEFAULT_BACKEND):
+        self.model_name = model_name
+        self.backend = backend
+        self.tokenizer = None
+        self.model = None
+        self.error = None
+        self.timings = {}  # fase -> detik
+        self._done = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="model-warmup", daemon=True)
+            self._thread.start()
+        return self
+
+    def _timed(self, phase, func):
+        start = time.perf_counter()
+        try:
+            return func()
+        finally:
+            self.timings[phase] = time.perf_counter() - start
+
+    def _run(self):
+        try:
+            tokenizer = self._timed('tokenizer', lambda: BertTokenizer.from_pretrained(self.model_name))
+            model = self._timed('model', lambda: BertForSequenceClassification.from_pretrained(self.model_name).eval())
+            model = self._timed('backend', lambda: build_backend(tokenizer, model, self.backend, self.model_name))
+            # Forward pass pertama selalu lambat (alokasi, lazy init) - lakukan di sini
+            self._timed('warmup', lambda: analyze_sentiment_batch(["warming up"], tokenizer, model))
+            self.tokenizer, self.model = tokenizer, model
+        except Exception as e:
+            self.error = e
+        finally:
+            self._done.set()
+
+    @property
+    def ready(self):
+        return self.model is not None
+
+    @property
+    def done(self):
+        return self._done.is_set()
+
+    def wait(self, timeout=None):
+        return self._done.wait(timeout)
+
+    # Identitas model untuk key cache hasil; fallback lexicon punya ID sendiri
+    @property
+    def model_id(self):
+        if self.ready:
+            return f"{self.model_name}:{self.backend}"
+        return LEXICON_MODEL_ID
+
+    def get(self):
+        tokenizer, model, _ = self.snapshot()
+        return tokenizer, model
+
+    # (tokenizer, model, model_id) dari satu pembacaan state, supaya ID cache selalu cocok
+    # dengan model yang dipakai walaupun warm-up selesai di tengah-tengah. model dibaca dulu:
+    # _run meng-assign tokenizer sebelum model.
+    def snapshot(self):
+        model = self.model
+        if model is None:
+            return None, None, LEXICON_MODEL_ID
+        return self.tokenizer, model, f"{self.model_name}:{self.backend}"
+
+# Kata lexicon untuk fallback (dicocokkan sebagai substring teks lowercase)
+NEGATIVE_WORDS = ('lama', 'tunggu', 'telat', 'macet', 'penuh', 'rusak', 'jelek', 'buruk', 'sebel', 'kesal', 'marah', 'frustrasi')
+POSITIVE_WORDS = ('bagus', 'baik', 'nyaman', 'cepat', 'murah', 'puas', 'senang', 'recommend', 'enak', 'mantap')
+
+# Scorer lexicon (fallback kalau model belum siap / tidak bisa di-load), HANYA Positif & Negatif.
+# Skor = jumlah kata negatif/positif berbeda yang muncul di teks. Untuk batch, satu pass RE2
+# (alternation semua kata) menyaring teks yang tidak memuat kata lexicon sama sekali, lalu
+# tiap kata dicek hanya di teks sisanya - semua di pyarrow, tanpa loop Python per teks.
+class LexiconScorer:
+    def __init__(self, negative_words=NEGATIVE_WORDS, positive_words=POSITIVE_WORDS, min_batch=32):
+        self.negative_words = tuple(negative_words)
+        self.positive_words = tuple(positive_words)
+        self.min_batch = min_batch  # Batch kecil lebih cepat lewat loop biasa
+        words = sorted(set(self.negative_words + self.positive_words), key=len, reverse=True)
+        self.any_pattern = '|'.join(re.escape(word) for word in words)
+        self.word_patterns = {word: re.escape(word) for word in words}
+
+    # (jumlah kata negatif, jumlah kata positif) per teks, sebagai array int64
+    def counts(self, texts):
+        texts = [str(t) for t in texts]
+        if not HAS_ARROW or len(texts) < self.min_batch:
+            negative, positive = np.zeros(len(texts), dtype=np.int64), np.zeros(len(texts), dtype=np.int64)
+            for i, text in enumerate(texts):
+                text_lower = text.lower()
+                negative[i] = sum(word in text_lower for word in self.negative_words)
+                positive[i] = sum(word in text_lower for word in self.positive_words)
+            return negative, positive
+
+        lowered = pc.utf8_lower(pa.array(texts, type=pa.large_string()))
+        candidates = np.flatnonzero(
+            pc.match_substring_regex(lowered, self.any_pattern).to_numpy(zero_copy_only=False)
+        )
+        subset = lowered.take(pa.array(candidates, type=pa.int64()))
+
+        def count(words):
+            totals = np.zeros(len(texts), dtype=np.int64)
+            if len(candidates):
+                hits = sum(
+                    pc.match_substring_regex(subset, self.word_patterns[word]).to_numpy(zero_copy_only=False).astype(np.int64)
+                    for word in words
+                )
+                totals[candidates] = hits
+            return totals
+
+        return count(self.negative_words), count(self.positive_words)
+
+    # [(label, confidence)] per teks. Confidence dari selisih skor (Laplace smoothing):
+    # 0.5 + 0.5 * |pos - neg| / (pos + neg + 1) -> seri = 0.5, makin jauh selisihnya makin mendekati 1
+    def score(self, texts):
+        negative, positive = self.counts(texts)
+        confidence = 0.5 + 0.5 * np.abs(positive - negative) / (positive + negative + 1)
+        # Jika sama, default ke Positif (sesuai trial_df yang hanya punya 2 label)
+        labels = np.where(negative > positive, "Negatif", "Positif")
+        return list(zip(labels.tolist(), confidence.tolist()))
+
+LEXICON = LexiconScorer()
+
+# Fungsi untuk analisis sentimen (fallback jika model tidak bisa load)
+def analyze_sentiment(text, tokenizer, model):
+    if tokenizer is None or model is None:
+        # Fallback ke lexicon-based (HANYA Positif & Negatif)
+        return LEXICON.score([text])[0]
+
+    # MODEL BARU - menggunakan agufsamudra/indo-sentiment-analysis
+    return analyze_sentiment_batch([text], tokenizer, model, batch_size=1)[0]
+
+# Analisis sentimen banyak teks sekaligus (micro-batch + dynamic padding)
+def analyze_sentiment_batch(texts, tokenizer, model, batch_size=32, max_length=128):
+    texts = [str(t) for t in texts]  # Terima list atau pandas Series
+
+    if tokenizer is None or model is None:
+        return LEXICON.score(texts)
+
+    if not texts:
+        return []
+
+    # Tokenisasi sekali tanpa padding, lalu urutkan berdasarkan panjang token
+    # supaya setiap micro-batch hanya di-pad sepanjang teks terpanjangnya
+    encodings = tokenizer(texts, truncation=True, max_length=max_length)
+    features = [
+        {key: encodings[key][i] for key in encodings.keys()}
+        for i in range(len(texts))
+    ]
+    order = sorted(range(len(texts)), key=lambda i: len(features[i]['input_ids']))
+
+    results = [None] * len(texts)
+    with torch.inference_mode():
+        for start in range(0, len(order), batch_size):
+            batch_idx = order[start:start + batch_size]
+            inputs = tokenizer.pad([features[i] for i in batch_idx], padding="longest", return_tensors="pt")
+
+            logits = model(**inputs).logits
+            probabilities = torch.nn.functional.softmax(logits, dim=-1)
+            confidences, predictions = probabilities.max(dim=-1)
+
+            for i, prediction, confidence in zip(batch_idx, predictions.tolist(), confidences.tolist()):
+                # TIDAK ADA NETRAL - langsung return Positif/Negatif berdasarkan prediction
+                results[i] = (SENTIMENT_LABELS[prediction], confidence)
+
+    return results